@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Measures how long it takes a fresh interpreter to import the client and
+build a Client, and checks that nothing heavy is imported eagerly.
+
+    python benchmarks/import_time.py [runs]
+
+Exits non-zero if requests, simplejson or any configuration module is loaded
+before the client is actually used.
+"""
+
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+import timeit
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import sys
+import opsviewclient.client
+c = opsviewclient.client.Client('http://localhost/rest', username='u',
+                                token='t')
+eager = sorted(m for m in sys.modules
+               if m in ('requests', 'simplejson') or
+               m.startswith('opsviewclient.v2.config.') and
+               m not in ('opsviewclient.v2.config.client',))
+print(','.join(eager))
+"""
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    cmd = [sys.executable, '-c', SNIPPET]
+
+    eager = subprocess.check_output(cmd, env=env).decode().strip()
+
+    baseline = timeit.repeat(
+        lambda: subprocess.check_call([sys.executable, '-c', 'pass'], env=env),
+        number=1, repeat=runs)
+    timings = timeit.repeat(
+        lambda: subprocess.check_output(cmd, env=env),
+        number=1, repeat=runs)
+
+    print('interpreter startup: %.1f ms' % (min(baseline) * 1000))
+    print('import + Client():   %.1f ms' % (min(timings) * 1000))
+    print('client overhead:     %.1f ms' %
+          ((min(timings) - min(baseline)) * 1000))
+
+    if eager:
+        print('eagerly imported: %s' % eager)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
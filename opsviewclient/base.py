@@ -2,9 +2,18 @@
 # coding: utf-8
 
 import copy
+import heapq
+
 import six
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
 from opsviewclient.fields import FieldAttributes as FA
 from opsviewclient.conv import field_encodings
+from opsviewclient.refs import Ref
 
 
 def get_id(obj):
@@ -21,11 +30,41 @@ def id_from_ref(obj):
     return obj.rsplit('/', 1)[-1]
 
 
+def int_id_from_ref(obj):
+    """Returns the id from a ref or its URI as an integer, using the
+    precomputed id of a Ref
+    """
+    if obj.__class__ is Ref:
+        return obj.id
+
+    return int(id_from_ref(obj))
+
+
+def type_from_ref(obj):
+    """Returns the resource type of a ref, e.g. 'host' for
+    /rest/config/host/1
+    """
+    if obj.__class__ is Ref:
+        return obj.type
+
+    if isinstance(obj, dict):
+        obj = obj['ref']
+
+    return obj.rsplit('/', 2)[-2]
+
+
 def nameref(name):
     """Returns a reference to a name as {'name': name}"""
     if name is None:
         return None
 
+    # The common cases first
+    if name.__class__ is Ref:
+        return name
+
+    if isinstance(name, six.string_types):
+        return {'name': name}
+
     if isinstance(name, Resource) and hasattr(name, 'name'):
         return {'name': getattr(name, 'name')}
 
@@ -51,6 +90,10 @@ def fmt_str(val):
     return None
 
 
+def _rebuild_resource(cls, info, loaded):
+    return cls(None, info, loaded=loaded)
+
+
 class Resource(object):
 
     def __init__(self, manager, info, loaded=False):
@@ -66,6 +109,27 @@ class Resource(object):
         info = ", ".join("%s=%s" % (k, getattr(self, k)) for k in reprkeys)
         return "<%s %s>" % (self.__class__.__name__, info)
 
+    def __reduce__(self):
+        # Pickle as just the class and info rather than the manager and the
+        # client (and its session) behind it. Unpickled resources aren't
+        # bound to any manager; the receiver chooses one with bind(), as any
+        # manager for the class could belong to another endpoint or user.
+        return (_rebuild_resource, (self.__class__, self._info, self._loaded))
+
+    # copy.copy() and copy.deepcopy() would otherwise go through __reduce__
+    # and leave the copy unbound
+    def __copy__(self):
+        return self.__class__(self.manager, self._info, loaded=self._loaded)
+
+    def __deepcopy__(self, memo):
+        return self.__class__(self.manager, copy.deepcopy(self._info, memo),
+                              loaded=self._loaded)
+
+    def bind(self, manager):
+        """Binds the resource to a manager, e.g. after unpickling"""
+        self.manager = manager
+        return self
+
     def is_loaded(self):
         return self._loaded
 
@@ -87,7 +151,16 @@ class Resource(object):
 
         return self._info == other._info
 
+    def __hash__(self):
+        # Objects of a type are compared by id, so hash the id. Only look at
+        # what is already known: hashing must never load the object.
+        return hash(self._info.get('id'))
+
     def _add_details(self, info):
+        # Field name -> (refs, [objects]) for the related objects resolved so
+        # far, dropped whenever the object is (re)loaded
+        self._related = {}
+
         info = self._decode(info)
         for (k, v) in six.iteritems(info):
             try:
@@ -100,16 +173,21 @@ class Resource(object):
         cpy = self.as_dict()
         return self.__class__(self.manager, info=cpy, loaded=True)
 
-    def encoded(self):
-        return self._encode(self.as_dict())
+    def encoded(self, full=False):
+        """Returns the object in the format expected by the API. If `full` is
+        set then read-only and omitted fields are kept, which gives a complete
+        copy of the object as the API returned it.
+        """
+        return self._encode(self.as_dict(), full=full)
 
     def decoded(self):
         return self._decode(self.as_dict())
 
     @classmethod
-    def _encode(cls, obj):
+    def _encode(cls, obj, full=False):
         fields = getattr(cls, '_fields_', None)
-        field_attrs = getattr(cls, '_field_attributes_', None)
+        field_attrs = (getattr(cls, '_field_attributes_', None)
+                       if not full else None)
 
         if not fields and not field_attrs:
             return obj
@@ -174,6 +252,74 @@ class Resource(object):
 
         raise AttributeError(k)
 
+    def _resolved(self, field, refs=None):
+        """Returns the list of objects resolved so far for the references in
+        `field`, starting a new one if the references have changed since
+        """
+        if refs is None:
+            refs = self._info[field]
+
+        entry = self._related.get(field)
+        if entry is None or entry[0] != refs:
+            snapshot = list(refs) if isinstance(refs, list) else refs
+            entry = self._related[field] = (snapshot, [])
+
+        return entry[1]
+
+    def _ref(self, field, manager_name):
+        """Returns the object referred to by `field`, from the manager
+        `manager_name` on the client's config (e.g. 'hosts'). Without a
+        manager the raw ref is returned.
+
+        The object is only fetched the first time; it is kept until the
+        reference changes or the object is reloaded.
+        """
+        ref = self._info.get(field)
+        if not ref:
+            return None
+
+        if not self.manager:
+            return ref
+
+        objs = self._resolved(field, ref)
+        if not objs:
+            manager = getattr(self.manager.client.config, manager_name)
+            obj = manager.get(id_from_ref(ref))
+            if not objs:
+                objs.append(obj)
+
+        return objs[0]
+
+    def _ref_list(self, field, manager_name):
+        """Yields the objects referred to by the list `field`, as _ref().
+        Objects are kept as they are fetched, so even an iteration that
+        stops early saves the next one the requests it made.
+        """
+        refs = self._info.get(field)
+        if not refs:
+            return
+
+        if not self.manager:
+            for ref in refs:
+                yield ref
+            return
+
+        objs = self._resolved(field, refs)
+        manager = None
+
+        for (i, ref) in enumerate(refs):
+            if i >= len(objs):
+                if manager is None:
+                    manager = getattr(self.manager.client.config,
+                                      manager_name)
+
+                obj = manager.get(id_from_ref(ref))
+                # Another iteration may have got here first
+                if i == len(objs):
+                    objs.append(obj)
+
+            yield objs[i]
+
     def get(self):
         self.set_loaded(True)
         if not hasattr(self.manager, 'get'):
@@ -195,6 +341,14 @@ class Manager(object):
 
     resource_class = None
 
+    # The type of resource as it appears in API refs,
+    # e.g. 'host' for /rest/config/host/1
+    resource_type = None
+
+    # How long responses may be kept if the client has a response cache.
+    # None uses the cache's default.
+    cache_ttl = None
+
     def __init__(self, api):
         self.api = api
 
@@ -202,8 +356,234 @@ class Manager(object):
     def client(self):
         return self.api
 
-    def _list(self, url, obj_class=None):
-        body = self.api.get(url)
+    def submit(self, fn, *args, **kwds):
+        """Calls `fn` through the client's transport, returning a
+        concurrent.futures.Future
+        """
+        return self.api.submit(fn, *args, **kwds)
+
+    def get_async(self, *args, **kwds):
+        return self.submit(self.get, *args, **kwds)
+
+    def list_async(self, *args, **kwds):
+        return self.submit(self.list, *args, **kwds)
+
+    def create_async(self, *args, **kwds):
+        return self.submit(self.create, *args, **kwds)
+
+    def update_async(self, *args, **kwds):
+        return self.submit(self.update, *args, **kwds)
+
+    def delete_async(self, *args, **kwds):
+        return self.submit(self.delete, *args, **kwds)
+
+    def _cached_get(self, url, params=None):
+        cache = getattr(self.api, 'cache', None)
+        if cache is None:
+            return self.api.get(url, params=params)
+
+        # A cache may be shared by clients for other servers or users, who
+        # must never be given each other's responses
+        key = (getattr(self.api, 'base_url', None),
+               getattr(self.api, '_username', None),
+               url, tuple(sorted(params.items())) if params else None)
+        return cache.fetch(self.resource_type, key,
+                           lambda: self.api.get(url, params=params),
+                           ttl=self.cache_ttl)
+
+    @property
+    def cache_stats(self):
+        """Returns the client's response cache statistics for this manager's
+        resource type, or None if the client has no cache
+        """
+        cache = getattr(self.api, 'cache', None)
+        if cache is None:
+            return None
+
+        return cache.stats(self.resource_type)
+
+    def _invalidate_cache(self):
+        cache = getattr(self.api, 'cache', None)
+        if cache is not None:
+            cache.invalidate(self.resource_type)
+
+    def _changed(self, body=None, url=None, deleted=False):
+        """Called after a create, update or delete has been sent; drops
+        cached responses for this type and records the change with the
+        client's change tracker
+        """
+        self._invalidate_cache()
+
+        changes = getattr(self.api, 'changes', None)
+        if changes is None:
+            return
+
+        if isinstance(body, dict):
+            body = [body]
+
+        ids = []
+        if isinstance(body, list):
+            ids = [o['id'] for o in body if isinstance(o, dict) and 'id' in o]
+
+        if not ids and url is not None:
+            ids = [url.rsplit('/', 1)[-1]]
+
+        for obj_id in ids or [None]:
+            changes.record(self.resource_type, obj_id, deleted=deleted)
+
+    def summary(self, search=None, **params):
+        """Returns the summary of a list request matching `search` without
+        fetching the objects themselves, e.g.
+
+            {'totalrows': '120', 'allrows': '450', 'rows': '1', 'page': '1',
+             'totalpages': '120'}
+
+        Any other keyword arguments are passed as query parameters, as with
+        the `kwds` argument to list().
+        """
+        params['rows'] = 1
+        params.setdefault('cols', 'id')
+        if search:
+            params['json_filter'] = json.dumps(search)
+
+        body = self.api.get('/config/%s' % self.resource_type, params=params)
+        return body['summary']
+
+    def count(self, search=None, **params):
+        """Returns the number of objects matching `search` with one small
+        request, rather than listing them all
+        """
+        return int(self.summary(search=search, **params)['totalrows'])
+
+    def scan(self, chunk_size=1000, search=None, **kwds):
+        """Iterates over every object matching `search` in id order, fetching
+        `chunk_size` objects at a time.
+
+        Rather than paging through the list with `page`, each request asks
+        for the objects with an id greater than the last one seen. Every
+        request costs the server the same however far into the list the scan
+        is, and objects created or deleted during the scan don't cause others
+        to be skipped or returned twice.
+
+        Any other keyword arguments (e.g. `in_use` or `cols`) are passed to
+        list(), apart from `rows`, `page` and `order`, which the scan sets.
+        """
+        kwds = self._id_order_kwds('scan', kwds, ('rows', 'page', 'order'))
+
+        last_id = None
+        while True:
+            chunk = self.list(rows=chunk_size, order='id',
+                              search=self._after_id(search, last_id), **kwds)
+
+            for obj in chunk:
+                yield obj
+
+            if len(chunk) < chunk_size:
+                return
+
+            last_id = int(chunk[-1]._info['id'])
+
+    @staticmethod
+    def _id_order_kwds(caller, kwds, reserved):
+        """Returns a copy of the list() arguments for a listing made in id
+        order, making sure the objects' ids are among the columns fetched.
+        Arguments in `reserved` are set by the caller itself.
+        """
+        for name in reserved:
+            if name in kwds:
+                raise TypeError('%s() does not accept %r' % (caller, name))
+
+        kwds = dict(kwds)
+        cols = kwds.get('cols')
+        if cols:
+            names = [c.strip() for c in cols.split(',')]
+            if 'id' not in names and '+id' not in names:
+                kwds['cols'] = cols + ',+id'
+
+        return kwds
+
+    @staticmethod
+    def _after_id(search, last_id):
+        if last_id is None:
+            return search
+
+        after = {'id': {'>': last_id}}
+        if not search:
+            return after
+
+        if isinstance(search, dict) and 'id' not in search:
+            search = dict(search)
+            search.update(after)
+            return search
+
+        return {'-and': [search, after]}
+
+    def sharded_list(self, shards=4, search=None, **kwds):
+        """Fetches every object matching `search` as `shards` list requests
+        run concurrently through the client's transport, returning an
+        iterator over the objects in id order.
+
+        The matching ids are listed first and split into contiguous id ranges
+        of about the same size, so that each shard is a disjoint slice of the
+        collection that a separate server worker can handle. Shards only run
+        in parallel if the transport's submit() does (e.g. a
+        ThreadPoolTransport).
+
+        Any other keyword arguments are passed to list(), apart from `page`
+        and `order`, which the shards set.
+        """
+        kwds = self._id_order_kwds('sharded_list', kwds, ('page', 'order'))
+        return self._fetch_shards(
+            [{'search': self._with_search(search, s)}
+             for s in self._id_shards(shards, search)],
+            **kwds)
+
+    def _id_shards(self, shards, search):
+        ids = sorted(int(o._info['id'])
+                     for o in self.list(cols='id', search=search))
+        if not ids:
+            return []
+
+        shards = max(1, min(shards, len(ids)))
+        size = -(-len(ids) // shards)
+
+        return [{'id': {'>=': ids[i], '<=': ids[min(i + size, len(ids)) - 1]}}
+                for i in range(0, len(ids), size)]
+
+    @staticmethod
+    def _with_search(search, extra):
+        if not search:
+            return extra
+
+        return {'-and': [search, extra]}
+
+    def _fetch_shards(self, shards, **kwds):
+        """Submits a list() for each dictionary of arguments in `shards`
+        (on top of `kwds`, as returned by _id_order_kwds()) and merges the
+        results by id
+        """
+        kwds['order'] = 'id'
+        kwds.setdefault('rows', 'all')
+
+        futures_ = []
+        for shard in shards:
+            shard_kwds = dict(kwds)
+            shard_kwds.update(shard)
+            if kwds.get('kwds') and 'kwds' in shard:
+                shard_kwds['kwds'] = dict(kwds['kwds'], **shard['kwds'])
+
+            futures_.append(self.submit(self.list, **shard_kwds))
+
+        def keyed(n, future):
+            # The shard number breaks ties so objects are never compared
+            for obj in future.result():
+                yield (int(obj._info['id']), n, obj)
+
+        merged = heapq.merge(*[keyed(n, f) for (n, f) in enumerate(futures_)])
+        return (obj for (_, _, obj) in merged)
+
+    def _list(self, url, obj_class=None, prefetch=None):
+        body = self._cached_get(url)
 
         if obj_class is None:
             obj_class = self.resource_class
@@ -212,10 +592,88 @@ class Manager(object):
 
         items = [obj_class(self, res, loaded=True) for res in data if res]
 
+        if prefetch:
+            self.prefetch_related(items, prefetch)
+
         return items
 
+    # The most ids to ask for in one prefetch request
+    prefetch_chunk_size = 500
+
+    def prefetch_related(self, objs, fields):
+        """Resolves the references in each of `fields` (API field names such
+        as 'hosttemplates' or 'check_period') for all of `objs` at once.
+
+        The distinct ids referred to are fetched with one list request per
+        related type (or per `prefetch_chunk_size` ids), using an `-in`
+        filter, and the results are attached to the objects so that their
+        reference properties don't make any further requests.
+
+        The requests are made in the calling thread. list() may itself be
+        running on the transport's thread pool (e.g. from list_async() or
+        sharded_list()), where waiting on more calls submitted to the same
+        pool could deadlock.
+        """
+        if isinstance(fields, six.string_types):
+            fields = [fields]
+
+        # Resource type -> set of ids referred to
+        wanted = {}
+        for obj in objs:
+            for field in fields:
+                for ref in self._refs(obj, field):
+                    wanted.setdefault(type_from_ref(ref), set()).add(
+                        int_id_from_ref(ref))
+
+        managers = self.api.config.managers()
+
+        # (resource type, id) -> object
+        found = {}
+        for (res_type, ids) in six.iteritems(wanted):
+            manager = managers.get(res_type)
+            if manager is None:
+                continue
+
+            ids = sorted(ids)
+            for i in range(0, len(ids), self.prefetch_chunk_size):
+                chunk = ids[i:i + self.prefetch_chunk_size]
+                for related in manager.list(search={'id': {'-in': chunk}}):
+                    found[(res_type, int(related._info['id']))] = related
+
+        for obj in objs:
+            for field in fields:
+                value = obj._info.get(field)
+                if not value or not isinstance(value, (dict, list)):
+                    continue
+
+                keys = [(type_from_ref(r), int_id_from_ref(r))
+                        for r in self._refs(obj, field)]
+
+                # Leave anything that couldn't be found to be fetched (and
+                # fail) as it would have been without the prefetch
+                if not all(k in found for k in keys):
+                    continue
+
+                obj._resolved(field)[:] = [found[k] for k in keys]
+
+        return objs
+
+    @staticmethod
+    def _refs(obj, field):
+        value = obj._info.get(field)
+        if not value:
+            return []
+
+        if isinstance(value, dict):
+            value = [value]
+
+        if not isinstance(value, list):
+            return []
+
+        return [r for r in value if isinstance(r, dict) and r.get('ref')]
+
     def _get(self, url, params=None):
-        body = self.api.get(url, params=params)
+        body = self._cached_get(url, params=params)
 
         return self.resource_class(self, body['object'], loaded=True)
 
@@ -227,6 +685,8 @@ class Manager(object):
         elif 'list' in body:
             body = body['list']
 
+        self._changed(body)
+
         if return_raw:
             return body
 
@@ -243,6 +703,8 @@ class Manager(object):
         elif 'list' in body:
             body = body['list']
 
+        self._changed(body, url=url)
+
         if body:
             return self.resource_class(self, body)
         else:
@@ -250,4 +712,5 @@ class Manager(object):
 
     def _delete(self, url):
         body = self.api.delete(url)
+        self._changed(url=url, deleted=True)
         return body
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import collections
+import threading
+import time
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+from opsviewclient import exceptions as exc
+
+
+class CacheStats(object):
+    """Counters for the lookups made against one namespace of a cache"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.negative = 0
+        self.evictions = 0
+
+    def as_dict(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'negative': self.negative,
+            'evictions': self.evictions,
+        }
+
+    def __repr__(self):
+        return '<CacheStats %s>' % ', '.join(
+            '%s=%d' % kv for kv in sorted(self.as_dict().items()))
+
+
+class ResponseCache(object):
+    """A bounded LRU cache of API responses.
+
+    Entries are grouped by namespace (the resource type of the manager which
+    made the request) so that a create, update or delete through a manager
+    can drop everything cached for that type. Responses are stored as
+    serialised JSON, which both bounds the cache by size in bytes and gives
+    every hit its own copy to decode.
+
+    The lifetime of an entry is, in order of precedence, the TTL given for
+    its namespace in `ttls`, the `cache_ttl` of the manager which cached it
+    or the cache's default `ttl`.
+
+    With `stale_ttl`, an expired entry is still returned for that many
+    seconds while it is refreshed in a background thread. With
+    `negative_ttl`, 404 responses are remembered and re-raised for that many
+    seconds instead of being requested again.
+    """
+
+    def __init__(self, ttl=60, max_entries=1024, max_size=None, ttls=None,
+                 stale_ttl=0, negative_ttl=0):
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.size = 0
+
+        # (namespace, key) -> (expires, data, not_found)
+        self._entries = collections.OrderedDict()
+        self._namespaces = {}
+        self._stats = {}
+        # Bumped by invalidate() (per namespace) and clear() (for all), so
+        # that a response fetched before then isn't stored afterwards
+        self._generations = {}
+        self._clear_generation = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self, namespace):
+        with self._lock:
+            return self._stats_for(namespace)
+
+    def _stats_for(self, namespace):
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = CacheStats()
+
+        return stats
+
+    def get(self, namespace, key):
+        """Returns a fresh copy of the cached response, or None on a miss"""
+        with self._lock:
+            entry = self._lookup(namespace, key)
+
+        if entry is None or entry[2] or entry[0] < time.time():
+            return None
+
+        return json.loads(entry[1])
+
+    def fetch(self, namespace, key, loader, ttl=None):
+        """Returns a copy of the cached response for `key`, calling `loader`
+        to make the request on a miss. Stale entries are returned straight
+        away and refreshed with `loader` in the background.
+        """
+        now = time.time()
+
+        with self._lock:
+            stats = self._stats_for(namespace)
+            entry = self._lookup(namespace, key)
+            refresh = False
+
+            if entry is None:
+                stats.misses += 1
+            elif entry[2]:
+                stats.negative += 1
+            elif entry[0] >= now:
+                stats.hits += 1
+            else:
+                stats.stale += 1
+                refresh = (namespace, key) not in self._refreshing
+                if refresh:
+                    self._refreshing.add((namespace, key))
+
+        if entry is None:
+            return self._load(namespace, key, loader, ttl)
+
+        if entry[2]:
+            raise exc.NotFound('Not found (cached): ', entry[1])
+
+        if refresh:
+            thread = threading.Thread(target=self._refresh,
+                                      args=(namespace, key, loader, ttl))
+            thread.daemon = True
+            thread.start()
+
+        return json.loads(entry[1])
+
+    def _generation(self, namespace):
+        return (self._clear_generation, self._generations.get(namespace, 0))
+
+    def _load(self, namespace, key, loader, ttl):
+        with self._lock:
+            generation = self._generation(namespace)
+
+        try:
+            body = loader()
+        except exc.NotFound as e:
+            if self.negative_ttl:
+                self._store(namespace, key, e.response or '',
+                            self.negative_ttl, not_found=True,
+                            generation=generation)
+            raise
+
+        self.set(namespace, key, body, ttl=ttl, generation=generation)
+        return body
+
+    def _refresh(self, namespace, key, loader, ttl):
+        try:
+            self._load(namespace, key, loader, ttl)
+        except Exception:
+            # The stale entry is kept until it falls out of its stale window
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard((namespace, key))
+
+    def _lookup(self, namespace, key):
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+
+        (expires, _, not_found) = entry
+        limit = expires if not_found else expires + self.stale_ttl
+        if limit < time.time():
+            self._remove((namespace, key))
+            return None
+
+        # Move to the most recently used end
+        del self._entries[(namespace, key)]
+        self._entries[(namespace, key)] = entry
+        return entry
+
+    def set(self, namespace, key, body, ttl=None, generation=None):
+        """Stores a response. If `generation` is given, the response is only
+        stored if the namespace hasn't been invalidated since it was read.
+        """
+        ttl = self.ttls.get(namespace, ttl if ttl is not None else self.ttl)
+        if not ttl:
+            return
+
+        self._store(namespace, key, json.dumps(body), ttl,
+                    generation=generation)
+
+    def _store(self, namespace, key, data, ttl, not_found=False,
+               generation=None):
+        if self.max_size is not None and len(data) > self.max_size:
+            return
+
+        with self._lock:
+            # The namespace changed while the response was being fetched, so
+            # it may be out of date already
+            if generation is not None and \
+                    generation != self._generation(namespace):
+                return
+
+            self._remove((namespace, key))
+            self._entries[(namespace, key)] = \
+                (time.time() + ttl, data, not_found)
+            self._namespaces.setdefault(namespace, set()).add(key)
+            self.size += len(data)
+            self._evict()
+
+    def after_fork(self):
+        """Resets the lock and pending refreshes in a forked child process,
+        where the threads that held them no longer exist
+        """
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    def invalidate(self, namespace):
+        """Drops every entry cached for a namespace"""
+        with self._lock:
+            self._generations[namespace] = \
+                self._generations.get(namespace, 0) + 1
+
+            for key in list(self._namespaces.get(namespace, ())):
+                self._remove((namespace, key))
+
+    def clear(self):
+        with self._lock:
+            self._clear_generation += 1
+            self._entries.clear()
+            self._namespaces.clear()
+            self.size = 0
+
+    def _remove(self, cache_key):
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return
+
+        self.size -= len(entry[1])
+        keys = self._namespaces.get(cache_key[0])
+        if keys is not None:
+            keys.discard(cache_key[1])
+
+    def _evict(self):
+        while self._entries and (
+                len(self._entries) > self.max_entries or
+                (self.max_size is not None and self.size > self.max_size)):
+
+            cache_key = next(iter(self._entries))
+            self._stats_for(cache_key[0]).evictions += 1
+            self._remove(cache_key)
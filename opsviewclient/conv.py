@@ -7,6 +7,12 @@ from opsviewclient.fields import(
     FieldAttributes as FA,
     FieldTypes as FT
 )
+from opsviewclient.refs import (
+    from_ref,
+    from_ref_list,
+    to_ref,
+    to_ref_list
+)
 
 
 def to_string(value):
@@ -67,6 +73,6 @@ field_encodings = {
     FT.BOOL_INT_STR: FieldEncoding(encode=to_bool_int_str, decode=to_bool),
     FT.INT: FieldEncoding(encode=to_int, decode=to_int),
     FT.INT_STR: FieldEncoding(encode=to_string, decode=to_int),
-    FT.REF: FieldEncoding(encode=do_nothing, decode=do_nothing),
-    FT.REF_LIST: FieldEncoding(encode=do_nothing, decode=do_nothing),
+    FT.REF: FieldEncoding(encode=from_ref, decode=to_ref),
+    FT.REF_LIST: FieldEncoding(encode=from_ref_list, decode=to_ref_list),
 }
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from opsviewclient import exceptions as exc
+
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+
+class Change(object):
+    """One difference between two listings. `old` and `new` are the encoded
+    records (None for an added or removed object respectively) and `fields`
+    maps each changed field to an (old value, new value) tuple.
+    """
+
+    __slots__ = ('kind', 'id', 'old', 'new', 'fields')
+
+    def __init__(self, kind, obj_id, old=None, new=None, fields=None):
+        self.kind = kind
+        self.id = obj_id
+        self.old = old
+        self.new = new
+        self.fields = fields or {}
+
+    def __repr__(self):
+        if self.kind == CHANGED:
+            return '<Change %s %s: %s>' % (self.kind, self.id,
+                                           ', '.join(sorted(self.fields)))
+
+        return '<Change %s %s>' % (self.kind, self.id)
+
+
+def _record(obj):
+    # Compare resources as the API sees them, so that the deltas are the
+    # same whether a listing came from the API or from a snapshot
+    if hasattr(obj, 'encoded'):
+        return obj.encoded(full=True)
+
+    return obj
+
+
+def _ordered(objs, side):
+    last_id = None
+
+    for obj in objs:
+        record = _record(obj)
+        obj_id = int(record['id'])
+
+        if last_id is not None and obj_id <= last_id:
+            raise exc.OpsviewClientException(
+                'The %s listing is not in ascending id order: %d after %d' %
+                (side, obj_id, last_id))
+
+        last_id = obj_id
+        yield (obj_id, record)
+
+
+def field_deltas(old, new, ignore=()):
+    """Returns {field: (old value, new value)} for each field which differs
+    between two encoded records. Missing fields are given as None.
+    """
+    deltas = {}
+
+    for field in set(old) | set(new):
+        if field in ignore:
+            continue
+
+        (old_value, new_value) = (old.get(field), new.get(field))
+        if old_value != new_value:
+            deltas[field] = (old_value, new_value)
+
+    return deltas
+
+
+def diff(old, new, ignore=('uncommitted',)):
+    """Yields a Change for each object added to, removed from or changed
+    between two listings of the same type.
+
+    Both listings must be iterables in ascending id order, e.g.
+    Manager.scan(), SnapshotStore.iter() or SharedSnapshot.iter(). They are
+    merge-joined one object at a time, so only the current object from each
+    side is held in memory, however large the listings are.
+    Manager.sharded_list() is in id order too, but holds every shard's
+    objects in memory at once. Resources are compared in their encoded form;
+    fields in `ignore` are left out of the comparison.
+
+        for change in diff.diff(store.iter(hosts), hosts.scan()):
+            print(change.kind, change.id, change.fields)
+    """
+    old = _ordered(old, 'old')
+    new = _ordered(new, 'new')
+
+    (old_id, old_record) = next(old, (None, None))
+    (new_id, new_record) = next(new, (None, None))
+
+    while old_id is not None or new_id is not None:
+        if new_id is None or (old_id is not None and old_id < new_id):
+            yield Change(REMOVED, old_id, old=old_record)
+            (old_id, old_record) = next(old, (None, None))
+
+        elif old_id is None or new_id < old_id:
+            yield Change(ADDED, new_id, new=new_record)
+            (new_id, new_record) = next(new, (None, None))
+
+        else:
+            fields = field_deltas(old_record, new_record, ignore=ignore)
+            if fields:
+                yield Change(CHANGED, old_id, old=old_record, new=new_record,
+                             fields=fields)
+
+            (old_id, old_record) = next(old, (None, None))
+            (new_id, new_record) = next(new, (None, None))
+
+
+def summary(changes):
+    """Returns a count of the changes of each kind"""
+    counts = {ADDED: 0, REMOVED: 0, CHANGED: 0}
+    for change in changes:
+        counts[change.kind] += 1
+
+    return counts
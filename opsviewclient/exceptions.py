@@ -8,3 +8,8 @@ class OpsviewClientException(Exception):
         message = (message + response if response else message)
         super(OpsviewClientException, self).__init__(message)
         self.response = response
+
+
+class NotFound(OpsviewClientException):
+    """Raised when the API responds with 404 Not Found"""
+    pass
@@ -21,10 +21,11 @@ class FieldTypes(object):
     # A boolean value represented as either '0' or '1' (quoted) to/from the API
     BOOL_INT_STR = 5
 
-    # A single ref as a dict
+    # A single ref as a dict, decoded to a refs.Ref
     REF = 6
 
-    # A list of references in the format {'name': ?, 'ref': /?}
+    # A list of references in the format {'name': ?, 'ref': /?}, decoded to a
+    # list of refs.Ref
     REF_LIST = 7
 
 
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import six
+
+from opsviewclient.fields import FieldTypes as FT
+from opsviewclient.refs import Ref
+
+
+def ref_key(ref):
+    """Returns a (resource type, id) tuple for a ref such as
+    {'name': 'foo', 'ref': '/rest/config/host/1'}, or None if the ref has no
+    URI
+    """
+    if ref.__class__ is Ref:
+        return (ref.type, ref.id)
+
+    if isinstance(ref, dict):
+        ref = ref.get('ref')
+
+    if not ref:
+        return None
+
+    (_, res_type, res_id) = ref.rsplit('/', 2)
+    return (res_type, int(res_id))
+
+
+def resource_key(obj):
+    """Returns a (resource type, id) tuple for a Resource. Tuples are returned
+    unchanged.
+    """
+    if isinstance(obj, tuple):
+        return obj
+
+    key = ref_key(obj._info.get('ref'))
+    if key is None and obj.manager is not None:
+        key = (obj.manager.resource_type, int(obj._info['id']))
+
+    return key
+
+
+def _removes(ref):
+    # Host service check entries carry remove_servicecheck alongside the ref
+    try:
+        return int(ref.get('remove_servicecheck') or 0) != 0
+    except (AttributeError, ValueError):
+        return False
+
+
+class ConfigGraph(object):
+    """An in-memory index of the references between configuration objects.
+
+    Nodes are (resource type, id) tuples such as ('host', 494). For every
+    REF and REF_LIST field declared in a resource's _fields_, the forward
+    index maps the referencing node to the nodes it refers to and the reverse
+    index maps the referenced node back to its referrers, so that both
+    directions can be queried without any further API calls:
+
+        graph = ConfigGraph.build(client)
+        template = ('hosttemplate', 137)
+        hosts = graph.referrers(template, resource_type='host',
+                                field='hosttemplates')
+    """
+
+    def __init__(self):
+        # node -> Resource
+        self.objects = {}
+
+        # node -> {field: [node, ...]}
+        self._forward = {}
+
+        # node -> {(resource type, field): set([node, ...])}
+        self._reverse = {}
+
+        # node -> {field: set([node, ...])} for the entries of a REF_LIST
+        # which remove what they refer to, e.g. host service checks with
+        # remove_servicecheck set, which take away a check that one of the
+        # host's templates would apply
+        self._removed = {}
+
+    @classmethod
+    def build(cls, client, types=None, **kwds):
+        """Builds a graph with one list request per manager. `types` limits
+        the sweep to the given resource types (e.g. ['host', 'hosttemplate']);
+        any other keyword arguments are passed to each manager's list()
+        """
+        graph = cls()
+
+        for (res_type, manager) in six.iteritems(client.config.managers()):
+            if types is not None and res_type not in types:
+                continue
+
+            for obj in manager.list(**kwds):
+                graph.add(obj)
+
+        return graph
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __contains__(self, obj):
+        return resource_key(obj) in self.objects
+
+    def get(self, obj):
+        return self.objects.get(resource_key(obj))
+
+    def add(self, obj):
+        """Adds or replaces a resource in the index"""
+        key = resource_key(obj)
+        self.remove(key, keep_referrers=True)
+        self.objects[key] = obj
+
+        fields = getattr(obj, '_fields_', None) or {}
+        edges = {}
+        removed = {}
+
+        for (field, field_type) in six.iteritems(fields):
+            if field_type not in (FT.REF, FT.REF_LIST):
+                continue
+
+            value = obj._info.get(field)
+            if not value:
+                continue
+
+            if field_type == FT.REF:
+                value = [value]
+
+            targets = [k for k in (ref_key(r) for r in value) if k]
+            if not targets:
+                continue
+
+            edges[field] = targets
+            for target in targets:
+                referrers = self._reverse.setdefault(target, {})
+                referrers.setdefault((key[0], field), set()).add(key)
+
+            removes = set(ref_key(r) for r in value if _removes(r))
+            removes.discard(None)
+            if removes:
+                removed[field] = removes
+
+        self._forward[key] = edges
+        if removed:
+            self._removed[key] = removed
+
+        return key
+
+    def remove(self, obj, keep_referrers=False):
+        """Removes a resource and its outgoing references from the index.
+        Incoming references are kept when `keep_referrers` is set, as they
+        belong to the referring objects.
+        """
+        key = resource_key(obj)
+        self.objects.pop(key, None)
+        self._removed.pop(key, None)
+
+        for (field, targets) in six.iteritems(self._forward.pop(key, {})):
+            for target in targets:
+                referrers = self._reverse.get(target)
+                if not referrers:
+                    continue
+
+                nodes = referrers.get((key[0], field))
+                if nodes:
+                    nodes.discard(key)
+                    if not nodes:
+                        del referrers[(key[0], field)]
+
+                if not referrers:
+                    del self._reverse[target]
+
+        if not keep_referrers:
+            self._reverse.pop(key, None)
+
+    def references(self, obj, field=None):
+        """Returns the set of nodes that `obj` refers to, optionally limited to
+        a single field (using the API's field name, e.g. 'hosttemplates')
+        """
+        edges = self._forward.get(resource_key(obj), {})
+
+        if field is not None:
+            return set(edges.get(field, ()))
+
+        return set(k for targets in six.itervalues(edges) for k in targets)
+
+    def referrers(self, obj, resource_type=None, field=None):
+        """Returns the set of nodes which refer to `obj`, optionally limited to
+        referrers of a given type and/or through a given field
+        """
+        result = set()
+
+        for ((src_type, src_field), nodes) in six.iteritems(
+                self._reverse.get(resource_key(obj), {})):
+
+            if resource_type is not None and src_type != resource_type:
+                continue
+
+            if field is not None and src_field != field:
+                continue
+
+            result.update(nodes)
+
+        return result
+
+    def resolve(self, nodes):
+        """Returns the indexed resources for the given nodes, skipping nodes
+        which were not part of the sweep
+        """
+        return [self.objects[k] for k in nodes if k in self.objects]
+
+    def effective_service_checks(self, host):
+        """Returns the service check nodes applied to a host either directly
+        or through its host templates, less those the host removes
+        """
+        removed = self._removed.get(resource_key(host), {}).get(
+            'servicechecks', set())
+
+        checks = set()
+        for template in self.references(host, field='hosttemplates'):
+            checks.update(self.references(template, field='servicechecks'))
+
+        checks.update(self.references(host, field='servicechecks'))
+        return checks - removed
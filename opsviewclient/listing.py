@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from opsviewclient import base
+
+
+# Helpers for comparing and looking up objects in large listings, e.g.
+#
+#     (added, removed) = listing.added_removed(old_hosts, new_hosts)
+#
+# Each builds at most one dictionary of keys, so they take linear time.
+# Objects are keyed by id unless another field name, or a callable returning
+# the key for an object, is given as `key`. Keys are read from the
+# information each object already holds, so nothing is loaded from the API
+# just to be compared. Plain dictionaries are keyed the same way, except that
+# refs ({'name': ?, 'ref': ?} dictionaries and Refs) are keyed by the integer
+# id in their URI, so that they match the objects they refer to.
+
+
+def _key_func(key):
+    if callable(key):
+        return key
+
+    def get(obj):
+        info = getattr(obj, '_info', None)
+        if info is not None:
+            return info.get(key)
+
+        # Refs have no id of their own, so use the id in their URI
+        if key == 'id' and 'id' not in obj and obj.get('ref'):
+            return base.int_id_from_ref(obj)
+
+        return obj.get(key)
+
+    return get
+
+
+def index(objs, key='id'):
+    """Returns a dictionary of key to object. Later objects replace earlier
+    ones with the same key.
+    """
+    get = _key_func(key)
+    return dict((get(obj), obj) for obj in objs)
+
+
+def keys(objs, key='id'):
+    """Returns the set of keys of the objects"""
+    get = _key_func(key)
+    return set(get(obj) for obj in objs)
+
+
+def difference(objs, others, key='id'):
+    """Returns the objects in `objs` whose key isn't in `others`, in order"""
+    get = _key_func(key)
+    other_keys = keys(others, key=get)
+    return [obj for obj in objs if get(obj) not in other_keys]
+
+
+def intersection(objs, others, key='id'):
+    """Returns the objects in `objs` whose key is also in `others`, in
+    order
+    """
+    get = _key_func(key)
+    other_keys = keys(others, key=get)
+    return [obj for obj in objs if get(obj) in other_keys]
+
+
+def added_removed(old, new, key='id'):
+    """Returns a tuple of the objects only in `new` (added) and the objects
+    only in `old` (removed)
+    """
+    old = list(old)
+    new = list(new)
+
+    return (difference(new, old, key=key), difference(old, new, key=key))
+
+
+def pairs(old, new, key='id'):
+    """Yields (old object, new object) for each key found in both listings,
+    in the order of `new`
+    """
+    get = _key_func(key)
+    old_index = index(old, key=get)
+
+    for obj in new:
+        k = get(obj)
+        if k in old_index:
+            yield (old_index[k], obj)
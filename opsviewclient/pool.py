@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import collections
+import hashlib
+import threading
+import time
+
+from opsviewclient import exceptions as exc
+from opsviewclient.v2.client import Client
+
+
+def _normalise_endpoint(endpoint):
+    return endpoint if endpoint[-1] == '/' else endpoint + '/'
+
+
+def _fingerprint(password, token):
+    # Only a digest of the credentials is kept so that a client is never
+    # handed to a caller presenting different credentials for the same user
+    digest = hashlib.sha256()
+    for value in (password, token):
+        digest.update(b'\0' + (value or '').encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+class ClientPool(object):
+    """A thread-safe pool of clients shared by endpoint and username.
+
+    Services which build a client per request can use get() instead to
+    reuse a client, along with its connection pool and token, across
+    requests and threads:
+
+        pool = ClientPool(max_size=16, idle_timeout=600)
+        client = pool.get('https://opsview/rest', username='admin',
+                          password='secret')
+
+    At most `max_size` clients are kept; the least recently used one is
+    dropped when the pool is full. Clients unused for `idle_timeout` seconds
+    are dropped on the next call to get() or evict_idle(). Dropped clients
+    are not closed, as other threads may still be using them; their
+    connections are closed once they are garbage collected.
+
+    Any other keyword arguments are passed to each new Client. A cache or
+    transport must not be shared by the clients of different users, so
+    rather than a `cache` or `transport`, pass a `cache_factory` or
+    `transport_factory` which is called to make one for each new client.
+    """
+
+    # Client arguments which hold state and so can't be shared by clients
+    _stateful_kwds = ('cache', 'transport')
+
+    def __init__(self, max_size=32, idle_timeout=300, cache_factory=None,
+                 transport_factory=None, **client_kwds):
+        for name in self._stateful_kwds:
+            if name in client_kwds:
+                raise exc.OpsviewClientException(
+                    'A %s cannot be shared by every client in a pool; pass '
+                    '%s_factory instead' % (name, name))
+
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.cache_factory = cache_factory
+        self.transport_factory = transport_factory
+        self.client_kwds = client_kwds
+
+        # (endpoint, username) -> (client, fingerprint, last used)
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def get(self, endpoint, username, password=None, token=None, **kwds):
+        key = (_normalise_endpoint(endpoint), username)
+        fingerprint = _fingerprint(password, token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._clients.pop(key, None)
+
+            # A client for other credentials is replaced, but not closed
+            if entry is not None and entry[1] != fingerprint:
+                entry = None
+
+            if entry is None:
+                client = Client(endpoint, username=username,
+                                password=password, token=token,
+                                **self._new_client_kwds(kwds))
+            else:
+                client = entry[0]
+
+            self._clients[key] = (client, fingerprint, now)
+            self._evict(now)
+
+        return client
+
+    def _new_client_kwds(self, kwds):
+        client_kwds = dict(self.client_kwds, **kwds)
+
+        if self.cache_factory is not None and 'cache' not in kwds:
+            client_kwds['cache'] = self.cache_factory()
+
+        if self.transport_factory is not None and 'transport' not in kwds:
+            client_kwds['transport'] = self.transport_factory()
+
+        return client_kwds
+
+    def evict_idle(self):
+        """Drops clients which have been idle for longer than idle_timeout"""
+        with self._lock:
+            self._evict(time.time())
+
+    def _evict(self, now):
+        if self.idle_timeout is not None:
+            for (key, (_, _, last_used)) in list(self._clients.items()):
+                if last_used + self.idle_timeout < now:
+                    del self._clients[key]
+
+        while len(self._clients) > self.max_size:
+            self._clients.popitem(last=False)
+
+    def close(self):
+        """Drops every client from the pool. The clients aren't closed, as
+        they have been handed out and may still be in use.
+        """
+        with self._lock:
+            self._clients.clear()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_client(endpoint, username, password=None, token=None, **kwds):
+    """Returns a client from the process-wide pool"""
+    global _default_pool
+
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = ClientPool()
+
+    return _default_pool.get(endpoint, username, password=password,
+                             token=token, **kwds)
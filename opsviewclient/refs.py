@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+
+class Ref(dict):
+    """An immutable reference to another object, as returned by the API:
+
+        {'name': 'foo', 'ref': '/rest/config/host/1'}
+
+    A Ref is still a dictionary, so existing code which reads refs with
+    ref['name'] or serialises them to JSON is unaffected, but it cannot be
+    changed, it can be hashed (so refs can be used in sets and as dictionary
+    keys) and the resource type and integer id in the URI are parsed once,
+    up front, as `type` and `id`. A ValueError is raised if the URI doesn't
+    end with a type and an integer id.
+    """
+
+    __slots__ = ('id', 'type')
+
+    def __init__(self, name, ref):
+        try:
+            (_, res_type, res_id) = ref.rsplit('/', 2)
+            res_id = int(res_id)
+        except (AttributeError, ValueError):
+            raise ValueError('Not a ref URI: %r' % (ref,))
+
+        dict.__init__(self, name=name, ref=ref)
+        object.__setattr__(self, 'type', res_type)
+        object.__setattr__(self, 'id', res_id)
+
+    @property
+    def name(self):
+        return dict.__getitem__(self, 'name')
+
+    @property
+    def ref(self):
+        return dict.__getitem__(self, 'ref')
+
+    def __repr__(self):
+        return 'Ref(%r, %r)' % (self.name, self.ref)
+
+    def __hash__(self):
+        return hash((self.ref, self.name))
+
+    def __reduce__(self):
+        return (Ref, (self.name, self.ref))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def as_dict(self):
+        """Returns the ref as a plain (mutable) dictionary"""
+        return {'name': self.name, 'ref': self.ref}
+
+    def _immutable(self, *args, **kwds):
+        raise TypeError('Ref objects are immutable')
+
+    __setattr__ = __delattr__ = _immutable
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+
+def to_ref(value):
+    """Returns a Ref for a {'name': ?, 'ref': ?} dictionary. Anything else,
+    including refs with extra keys or a URI that can't be parsed, is returned
+    unchanged.
+    """
+    if value.__class__ is Ref or not isinstance(value, dict):
+        return value
+
+    if len(value) != 2 or not value.get('ref') or 'name' not in value:
+        return value
+
+    try:
+        return Ref(value['name'], value['ref'])
+    except ValueError:
+        return value
+
+
+def to_ref_list(value):
+    if not isinstance(value, list):
+        return value
+
+    return [to_ref(v) for v in value]
+
+
+def from_ref(value):
+    """Returns a Ref as a plain dictionary, in the form the API expects"""
+    if value.__class__ is Ref:
+        return value.as_dict()
+
+    return value
+
+
+def from_ref_list(value):
+    if not isinstance(value, list):
+        return value
+
+    return [from_ref(v) for v in value]
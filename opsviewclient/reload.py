@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import threading
+import time
+
+from opsviewclient import exceptions as exc
+
+
+# server_status values returned by /rest/reload
+STATUS_RUNNING = 0
+STATUS_RELOADING = 1
+STATUS_NOT_RUNNING = 2
+STATUS_ERROR = 3
+STATUS_WARNINGS = 4
+
+
+def server_status(status):
+    return int(status.get('server_status', STATUS_RUNNING))
+
+
+def _in_thread(fn, *args, **kwds):
+    """Runs `fn` in a new daemon thread, returning a Future for its result"""
+    from concurrent import futures
+
+    future = futures.Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            future.set_result(fn(*args, **kwds))
+        except Exception as e:
+            future.set_exception(e)
+
+    thread = threading.Thread(target=run)
+    thread.daemon = True
+    thread.start()
+    return future
+
+
+def _chained(future):
+    """Returns a new Future which is resolved along with `future`.
+    Cancelling it only cancels the caller's own copy.
+    """
+    from concurrent import futures
+
+    chained = futures.Future()
+
+    def done(f):
+        if not chained.set_running_or_notify_cancel():
+            return
+
+        error = f.exception()
+        if error is not None:
+            chained.set_exception(error)
+        else:
+            chained.set_result(f.result())
+
+    future.add_done_callback(done)
+    return chained
+
+
+def _countable(manager):
+    # Only types with an uncommitted field can be asked what's pending
+    fields = getattr(manager.resource_class, '_fields_', None) or {}
+    return 'uncommitted' in fields
+
+
+class ChangeTracker(object):
+    """Records the objects a client has created, updated or deleted since the
+    last reload.
+
+    Updates which the managers skip because nothing changed are not sent, so
+    they are not recorded either; an idempotent sync run leaves the tracker
+    empty. pending() then asks the server how many objects of each touched
+    type are still uncommitted, with a one row count request per type.
+    Deleted objects leave nothing to count, so they are always pending.
+    """
+
+    def __init__(self):
+        # resource type -> {id: sequence number of its latest record}
+        self._changes = {}
+        self._deleted = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(ids) for ids in self._changes.values())
+
+    def __bool__(self):
+        return bool(self._changes)
+
+    __nonzero__ = __bool__
+
+    def record(self, resource_type, obj_id=None, deleted=False):
+        with self._lock:
+            self._seq += 1
+            self._changes.setdefault(resource_type, {})[obj_id] = self._seq
+            if deleted:
+                self._deleted.setdefault(resource_type, {})[obj_id] = \
+                    self._seq
+
+    def changes(self):
+        """Returns a {resource type: set of ids} copy of the recorded
+        changes. An id of None stands for objects whose id isn't known.
+        """
+        with self._lock:
+            return dict((t, set(ids)) for (t, ids) in self._changes.items())
+
+    def deleted(self):
+        """Returns a {resource type: set of ids} copy of the recorded
+        deletes
+        """
+        with self._lock:
+            return dict((t, set(ids)) for (t, ids) in self._deleted.items())
+
+    def mark(self):
+        """Returns a marker for the changes recorded so far, to pass to
+        clear()
+        """
+        with self._lock:
+            return self._seq
+
+    def clear(self, upto=None):
+        """Forgets the recorded changes, or only those recorded up to the
+        marker `upto` from mark(). Changes recorded since are kept, even
+        for the same objects.
+        """
+        with self._lock:
+            for recorded in (self._changes, self._deleted):
+                if upto is None:
+                    recorded.clear()
+                    continue
+
+                for (resource_type, ids) in list(recorded.items()):
+                    for (obj_id, seq) in list(ids.items()):
+                        if seq <= upto:
+                            del ids[obj_id]
+
+                    if not ids:
+                        del recorded[resource_type]
+
+    def pending(self, client):
+        """Returns {resource type: number of uncommitted objects} for each
+        type this client has changed. Deleted objects are included in the
+        count.
+        """
+        managers = client.config.managers()
+        deleted = self.deleted()
+        counts = {}
+
+        for resource_type in self.changes():
+            manager = managers.get(resource_type)
+            if manager is None or not _countable(manager):
+                # Assume that anything we can't check needs a reload
+                counts[resource_type] = None
+                continue
+
+            counts[resource_type] = \
+                manager.count(search={'uncommitted': 1}) + \
+                len(deleted.get(resource_type, ()))
+
+        return counts
+
+    def has_pending(self, client):
+        """Returns whether a reload is needed. If nothing this client
+        changed is pending, every type which can be counted is checked too,
+        as changes made through other clients or processes aren't recorded
+        here.
+        """
+        if any(c is None or c > 0 for c in self.pending(client).values()):
+            return True
+
+        return any(manager.count(search={'uncommitted': 1}) > 0
+                   for manager in client.config.managers().values()
+                   if _countable(manager))
+
+    def after_fork(self):
+        """Replaces the lock, which another thread of the parent process may
+        have held when it forked
+        """
+        self._lock = threading.Lock()
+
+
+class ReloadScheduler(object):
+    """Batches reload requests from many callers into as few reloads as
+    possible.
+
+    Each request_reload() restarts a `debounce` second timer; when it
+    expires (or `max_delay` seconds after the first request of the batch) a
+    single asynchronous reload is started and /rest/reload is polled, backing
+    off from `poll_interval` up to `max_poll_interval` seconds, until the
+    server has finished. Requests made while a reload is running are batched
+    into the next one.
+
+        scheduler = ReloadScheduler(client)
+        for host in hosts:
+            client.config.hosts.update(host, ...)
+            scheduler.request_reload()
+
+        scheduler.wait_for_reload(callback=print)
+    """
+
+    def __init__(self, client, debounce=5.0, max_delay=60.0,
+                 poll_interval=2.0, max_poll_interval=30.0, backoff=1.5,
+                 skip_if_clean=True):
+        self.client = client
+        self.skip_if_clean = skip_if_clean
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._timer = None
+        self._first_request = None
+        self._pending = None
+        self._running = None
+        self._callbacks = []
+
+    def request_reload(self):
+        """Asks for a reload, returning a concurrent.futures.Future which is
+        resolved with the final reload status once a reload covering this
+        request has finished. Each caller gets its own Future, so cancelling
+        one doesn't cancel the reload for the rest of the batch.
+        """
+        from concurrent import futures
+
+        with self._lock:
+            now = time.time()
+
+            if self._pending is None:
+                self._pending = futures.Future()
+                self._first_request = now
+
+            if self._timer is not None:
+                self._timer.cancel()
+
+            delay = min(self.debounce,
+                        max(0, self._first_request + self.max_delay - now))
+
+            self._timer = threading.Timer(delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+            return _chained(self._pending)
+
+    def flush(self):
+        """Starts the pending reload now rather than waiting for the debounce
+        timer. Returns its Future, or None if nothing is pending.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            pending = self._pending
+
+        if pending is None:
+            return None
+
+        _in_thread(self._fire)
+        return _chained(pending)
+
+    def _fire(self):
+        # Only one reload runs at a time; a batch which fires while another
+        # reload is running waits for it to finish
+        with self._reload_lock:
+            with self._lock:
+                future = self._pending
+                self._pending = None
+                self._timer = None
+                self._running = future
+
+            if future is None or not future.set_running_or_notify_cancel():
+                return
+
+            try:
+                future.set_result(self._reload())
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._running = None
+
+    def _reload(self):
+        changes = getattr(self.client, 'changes', None)
+        upto = changes.mark() if changes is not None else None
+
+        if self.skip_if_clean and changes is not None and \
+                not changes.has_pending(self.client):
+            # Only forget what was checked; anything recorded since is kept
+            changes.clear(upto)
+            status = self.client.reload_status()
+            self._notify(status)
+            return status
+
+        # Changes made from here on need another reload
+        if changes is not None:
+            changes.clear(upto)
+
+        status = self.client.reload(asynchronous=True)
+        self._notify(status)
+
+        if server_status(status) == STATUS_RELOADING:
+            status = self._poll()
+
+        if server_status(status) in (STATUS_NOT_RUNNING, STATUS_ERROR):
+            raise exc.OpsviewClientException(
+                'Reload failed: ', repr(status.get('messages', status)))
+
+        return status
+
+    def _poll(self, timeout=None):
+        interval = self.poll_interval
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while True:
+            status = self.client.reload_status()
+            self._notify(status)
+
+            if server_status(status) != STATUS_RELOADING:
+                return status
+
+            if deadline is not None and time.time() + interval > deadline:
+                raise exc.OpsviewClientException('Timed out waiting for '
+                                                 'reload to finish')
+
+            time.sleep(interval)
+            interval = min(interval * self.backoff, self.max_poll_interval)
+
+    def _notify(self, status):
+        for callback in list(self._callbacks):
+            callback(status)
+
+    def add_callback(self, callback):
+        """Registers a callable which is passed each reload status as it is
+        polled
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def wait_for_reload(self, timeout=None, callback=None):
+        """Blocks until the pending and running reloads have finished and
+        returns the final status. If this scheduler has nothing pending, waits
+        for any reload already running on the server.
+        """
+        if callback is not None:
+            self.add_callback(callback)
+
+        try:
+            with self._lock:
+                futures_ = [f for f in (self._running, self._pending)
+                            if f is not None]
+
+            if not futures_:
+                return self._poll(timeout=timeout)
+
+            # The timeout covers all of the reloads, not each in turn
+            deadline = time.time() + timeout if timeout is not None else None
+
+            status = None
+            for future in futures_:
+                remaining = (max(0, deadline - time.time())
+                             if deadline is not None else None)
+                status = future.result(timeout=remaining)
+
+            return status
+        finally:
+            if callback is not None:
+                self.remove_callback(callback)
+
+    def wait_for_reload_async(self, timeout=None, callback=None, loop=None):
+        """Returns an asyncio future for wait_for_reload(), for use with
+        `await` in asynchronous code
+        """
+        import asyncio
+
+        return asyncio.wrap_future(
+            _in_thread(self.wait_for_reload, timeout=timeout,
+                       callback=callback),
+            loop=loop)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import mmap
+import os
+import struct
+import tempfile
+
+import six
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+from opsviewclient import base
+from opsviewclient.v2.config import hostgroups
+from opsviewclient.v2.config import hosts
+from opsviewclient.v2.config import servicechecks
+
+
+DEFAULT_TYPES = {
+    'host': hosts.Host,
+    'hostgroup': hostgroups.HostGroup,
+    'servicecheck': servicechecks.ServiceCheck,
+}
+
+_MAGIC = b'OVSS'
+_VERSION = 1
+
+# magic, version, generation, number of sections
+_HEADER = struct.Struct('<4sIQI')
+
+# type name, record count, name count, id index offset, name index offset
+_SECTION = struct.Struct('<32sIIQQ')
+
+# id, record offset, record length
+_ID_ENTRY = struct.Struct('<qQI')
+
+# name offset, name length, record offset, record length
+_NAME_ENTRY = struct.Struct('<QIQI')
+
+
+def _read_generation(path):
+    try:
+        with open(path, 'rb') as f:
+            (magic, _, generation, _) = _HEADER.unpack(f.read(_HEADER.size))
+    except (IOError, OSError, struct.error):
+        return 0
+
+    return generation if magic == _MAGIC else 0
+
+
+def write_snapshot(path, sections):
+    """Writes a read-only snapshot of resources to `path`.
+
+    `sections` maps a resource type (e.g. 'host') to an iterable of
+    resources. The file is written beside `path` and renamed into place, so
+    readers either see the previous generation or the new one, never a
+    partial file. Returns the generation number of the new file.
+    """
+    generation = _read_generation(path) + 1
+    sections = sorted((t, list(objs)) for (t, objs) in six.iteritems(sections))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    (fd, tmp_path) = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            table_size = _HEADER.size + _SECTION.size * len(sections)
+            f.write(b'\0' * table_size)
+            table = []
+
+            for (res_type, objs) in sections:
+                id_entries = []
+                name_entries = []
+
+                for obj in objs:
+                    info = obj.encoded(full=True)
+                    record = json.dumps(info).encode('utf-8')
+                    offset = f.tell()
+                    f.write(record)
+
+                    id_entries.append((int(info['id']), offset, len(record)))
+
+                    if info.get('name') is not None:
+                        name = info['name'].encode('utf-8')
+                        name_entries.append((name, offset, len(record)))
+
+                names = {}
+                for (name, _, _) in name_entries:
+                    if name not in names:
+                        names[name] = f.tell()
+                        f.write(name)
+
+                id_offset = f.tell()
+                for entry in sorted(id_entries):
+                    f.write(_ID_ENTRY.pack(*entry))
+
+                name_offset = f.tell()
+                for (name, offset, length) in sorted(name_entries):
+                    f.write(_NAME_ENTRY.pack(names[name], len(name), offset,
+                                             length))
+
+                table.append((res_type.encode('ascii'), len(objs),
+                              len(name_entries), id_offset, name_offset))
+
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, _VERSION, generation, len(table)))
+            for entry in table:
+                f.write(_SECTION.pack(*entry))
+
+        os.chmod(tmp_path, 0o644)
+        os.rename(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+    return generation
+
+
+def write_client_snapshot(path, client, types=None):
+    """Fetches hosts, service checks and host groups (or the resource types
+    in `types`) with one list request each and writes them to `path`
+    """
+    managers = client.config.managers()
+    types = types or sorted(DEFAULT_TYPES)
+
+    return write_snapshot(path, dict((t, managers[t].list()) for t in types))
+
+
+class _Section(object):
+
+    def __init__(self, res_type, count, name_count, id_offset, name_offset):
+        self.res_type = res_type
+        self.count = count
+        self.name_count = name_count
+        self.id_offset = id_offset
+        self.name_offset = name_offset
+
+
+class SharedSnapshot(object):
+    """A read-only view of a snapshot written by write_snapshot().
+
+    The file is memory-mapped, so every process that opens the same
+    generation shares the same physical pages and only the records that are
+    actually looked up are decoded. Lookups by id and by name are binary
+    searches over sorted index tables within the mapping.
+
+    A writer process replaces the file atomically; readers pick up the new
+    generation with reload(), which only re-maps the file if it has changed.
+    """
+
+    def __init__(self, path, managers=None):
+        self.path = path
+        self._managers = managers or {}
+        self._file = None
+        self._mm = None
+        self._stat = None
+        self.generation = None
+        self._sections = {}
+        self.reload()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+
+        self._mm = None
+        self._file = None
+
+    def reload(self):
+        """Maps the latest generation of the snapshot if the file has been
+        replaced since it was opened. Returns True if a new generation was
+        mapped.
+        """
+        st = os.stat(self.path)
+        if self._stat is not None and \
+                (st.st_ino, st.st_mtime) == self._stat:
+            return False
+
+        f = open(self.path, 'rb')
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, generation, count) = \
+            _HEADER.unpack_from(mm, 0)
+
+        if magic != _MAGIC or version != _VERSION:
+            mm.close()
+            f.close()
+            raise ValueError('%s is not a version %d snapshot' %
+                             (self.path, _VERSION))
+
+        sections = {}
+        for i in range(count):
+            entry = _SECTION.unpack_from(mm, _HEADER.size + i * _SECTION.size)
+            res_type = entry[0].rstrip(b'\0').decode('ascii')
+            sections[res_type] = _Section(res_type, *entry[1:])
+
+        self.close()
+        self._file = f
+        self._mm = mm
+        self._stat = (st.st_ino, st.st_mtime)
+        self._sections = sections
+        self.generation = generation
+        return True
+
+    def types(self):
+        return sorted(self._sections)
+
+    def __len__(self):
+        return sum(s.count for s in six.itervalues(self._sections))
+
+    def count(self, res_type):
+        section = self._sections.get(res_type)
+        return section.count if section else 0
+
+    def _resource(self, res_type, offset, length):
+        info = json.loads(self._mm[offset:offset + length].decode('utf-8'))
+        manager = self._managers.get(res_type)
+
+        if manager is not None:
+            return manager.resource_class(manager, info, loaded=True)
+
+        resource_class = DEFAULT_TYPES.get(res_type, base.Resource)
+        return resource_class(None, info, loaded=True)
+
+    def get(self, res_type, obj_id):
+        """Returns the resource with the given id, or None"""
+        section = self._sections.get(res_type)
+        if not section:
+            return None
+
+        obj_id = int(obj_id)
+        (lo, hi) = (0, section.count)
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (mid_id, offset, length) = _ID_ENTRY.unpack_from(
+                self._mm, section.id_offset + mid * _ID_ENTRY.size)
+
+            if mid_id == obj_id:
+                return self._resource(res_type, offset, length)
+            elif mid_id < obj_id:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return None
+
+    def get_by_name(self, res_type, name):
+        """Returns the first resource with the given name, or None"""
+        section = self._sections.get(res_type)
+        if not section:
+            return None
+
+        name = name.encode('utf-8')
+        (lo, hi) = (0, section.name_count)
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (name_offset, name_len, offset, length) = _NAME_ENTRY.unpack_from(
+                self._mm, section.name_offset + mid * _NAME_ENTRY.size)
+
+            mid_name = self._mm[name_offset:name_offset + name_len]
+            if mid_name < name:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < section.name_count:
+            (name_offset, name_len, offset, length) = _NAME_ENTRY.unpack_from(
+                self._mm, section.name_offset + lo * _NAME_ENTRY.size)
+
+            if self._mm[name_offset:name_offset + name_len] == name:
+                return self._resource(res_type, offset, length)
+
+        return None
+
+    def ids(self, res_type):
+        """Yields the ids of a resource type in ascending order"""
+        section = self._sections.get(res_type)
+        if not section:
+            return
+
+        for i in range(section.count):
+            yield _ID_ENTRY.unpack_from(
+                self._mm, section.id_offset + i * _ID_ENTRY.size)[0]
+
+    def iter(self, res_type):
+        """Yields the resources of a type in ascending id order"""
+        section = self._sections.get(res_type)
+        if not section:
+            return
+
+        for i in range(section.count):
+            (_, offset, length) = _ID_ENTRY.unpack_from(
+                self._mm, section.id_offset + i * _ID_ENTRY.size)
+            yield self._resource(res_type, offset, length)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import sqlite3
+import time
+
+import six
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    type TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT,
+    last_updated INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (type, id)
+);
+CREATE INDEX IF NOT EXISTS objects_name ON objects (type, name);
+CREATE TABLE IF NOT EXISTS sync_state (
+    type TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL,
+    last_updated INTEGER
+);
+"""
+
+
+class SnapshotStore(object):
+    """A persistent, SQLite-backed copy of the configuration.
+
+    Objects are stored in their full encoded form keyed by (resource type,
+    id). After the first sync, resources which carry `last_updated` are
+    refreshed by fetching only the objects changed since the previous sync
+    plus a list of ids to detect deletions; other resources are re-listed in
+    full.
+
+        store = SnapshotStore('/var/cache/opsview.db')
+        store.sync(client)
+        hosts = store.load(client.config.hosts)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def sync(self, client, types=None):
+        """Refreshes every config manager, or only those whose resource type
+        is in `types`
+        """
+        for (res_type, manager) in six.iteritems(client.config.managers()):
+            if types is not None and res_type not in types:
+                continue
+
+            self.refresh(manager)
+
+    def refresh(self, manager):
+        res_type = manager.resource_type
+        fields = getattr(manager.resource_class, '_fields_', None) or {}
+        synced_at = time.time()
+
+        row = self._conn.execute(
+            'SELECT last_updated FROM sync_state WHERE type = ?',
+            (res_type,)).fetchone()
+
+        incremental = 'last_updated' in fields and row and row[0] is not None
+
+        if incremental:
+            # Use >= so that objects changed within the same second as the
+            # previous sync are not missed
+            changed = manager.list(search={'last_updated': {'>=': row[0]}})
+            live_ids = set(int(o.id) for o in manager.list(cols='id'))
+        else:
+            changed = manager.list()
+            live_ids = None
+
+        with self._conn:
+            if incremental:
+                stored_ids = set(r[0] for r in self._conn.execute(
+                    'SELECT id FROM objects WHERE type = ?', (res_type,)))
+
+                self._conn.executemany(
+                    'DELETE FROM objects WHERE type = ? AND id = ?',
+                    [(res_type, i) for i in stored_ids - live_ids])
+            else:
+                self._conn.execute('DELETE FROM objects WHERE type = ?',
+                                   (res_type,))
+
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO objects '
+                '(type, id, name, last_updated, data) VALUES (?, ?, ?, ?, ?)',
+                [self._row(res_type, obj) for obj in changed])
+
+            (last_updated,) = self._conn.execute(
+                'SELECT MAX(last_updated) FROM objects WHERE type = ?',
+                (res_type,)).fetchone()
+
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state '
+                '(type, synced_at, last_updated) VALUES (?, ?, ?)',
+                (res_type, synced_at, last_updated))
+
+        return len(changed)
+
+    @staticmethod
+    def _row(res_type, obj):
+        info = obj._info
+        return (res_type, int(info['id']), info.get('name'),
+                info.get('last_updated'),
+                json.dumps(obj.encoded(full=True)))
+
+    def synced_at(self, manager):
+        """Returns the time of the last sync of a manager's resources"""
+        row = self._conn.execute(
+            'SELECT synced_at FROM sync_state WHERE type = ?',
+            (manager.resource_type,)).fetchone()
+
+        return row[0] if row else None
+
+    def load(self, manager):
+        """Returns every stored object of a manager's type, bound to that
+        manager
+        """
+        return list(self.iter(manager))
+
+    def iter(self, manager):
+        """Yields the stored objects of a manager's type in ascending id
+        order, reading them from the database one at a time
+        """
+        cursor = self._conn.execute(
+            'SELECT data FROM objects WHERE type = ? ORDER BY id',
+            (manager.resource_type,))
+
+        for (data,) in cursor:
+            yield manager.resource_class(manager, json.loads(data),
+                                         loaded=True)
+
+    def get(self, manager, obj_id=None, name=None):
+        """Returns a stored object by id or by name, or None if it isn't in
+        the snapshot
+        """
+        if obj_id is not None:
+            row = self._conn.execute(
+                'SELECT data FROM objects WHERE type = ? AND id = ?',
+                (manager.resource_type, int(obj_id))).fetchone()
+        else:
+            row = self._conn.execute(
+                'SELECT data FROM objects WHERE type = ? AND name = ?',
+                (manager.resource_type, name)).fetchone()
+
+        if not row:
+            return None
+
+        return manager.resource_class(manager, json.loads(row[0]),
+                                      loaded=True)
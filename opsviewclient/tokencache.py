@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import contextlib
+import errno
+import os
+import stat
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+
+def default_path():
+    base = os.environ.get('XDG_CACHE_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+
+    return os.path.join(base, 'opsviewclient', 'tokens.json')
+
+
+class FileTokenCache(object):
+    """Stores API tokens on disk so that consecutive processes can reuse a
+    valid token instead of logging in again.
+
+    Tokens are keyed by endpoint and username. The cache file is only ever
+    readable by its owner; a file with looser permissions is ignored rather
+    than trusted. Reads and writes are serialised between processes with an
+    advisory lock and the file is replaced atomically.
+
+    Tokens older than `max_age` seconds are not returned. Opsview expires
+    tokens after a period of inactivity, so the client also discards a cached
+    token and logs in again if the API rejects it.
+    """
+
+    def __init__(self, path=None, max_age=None):
+        self.path = path or default_path()
+        self.max_age = max_age
+
+    @staticmethod
+    def _key(endpoint, username):
+        return '%s|%s' % (endpoint, username)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, 0o700)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        if fcntl is None:
+            yield
+            return
+
+        fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _read(self):
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError as e:
+            if e.errno == errno.ENOENT:
+                return {}
+            raise
+
+        with os.fdopen(fd) as f:
+            st = os.fstat(f.fileno())
+            if st.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                return {}
+
+            if hasattr(os, 'getuid') and st.st_uid != os.getuid():
+                return {}
+
+            try:
+                return json.load(f)
+            except ValueError:
+                return {}
+
+    def _write(self, tokens):
+        directory = os.path.dirname(self.path)
+        (fd, tmp_path) = tempfile.mkstemp(dir=directory, prefix='.tokens-')
+
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(tokens, f)
+
+            os.rename(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, endpoint, username):
+        with self._locked():
+            entry = self._read().get(self._key(endpoint, username))
+
+        if not entry:
+            return None
+
+        if self.max_age is not None and \
+                entry.get('created', 0) + self.max_age < time.time():
+            return None
+
+        return entry.get('token')
+
+    def set(self, endpoint, username, token):
+        with self._locked():
+            tokens = self._read()
+            tokens[self._key(endpoint, username)] = {
+                'token': token,
+                'created': time.time(),
+            }
+            self._write(tokens)
+
+    def delete(self, endpoint, username):
+        with self._locked():
+            tokens = self._read()
+            if tokens.pop(self._key(endpoint, username), None) is not None:
+                self._write(tokens)
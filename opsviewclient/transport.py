@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import threading
+
+from opsviewclient import exceptions as exc
+
+
+class Transport(object):
+    """Sends HTTP requests on behalf of a Client.
+
+    send() takes the method, full URL, an already serialised body, query
+    params and headers, and returns a (status code, body bytes) tuple. The
+    returned body must already be decoded from any Content-Encoding the
+    server applied (the client asks for gzip or deflate).
+
+    submit() runs a callable and returns a concurrent.futures.Future for its
+    result. The base implementation runs it straight away in the calling
+    thread; ThreadPoolTransport runs it on a thread pool so that callers can
+    overlap many requests.
+    """
+
+    def send(self, method, url, body=None, params=None, headers=None):
+        raise NotImplementedError()
+
+    def submit(self, fn, *args, **kwds):
+        from concurrent import futures
+
+        future = futures.Future()
+        try:
+            future.set_result(fn(*args, **kwds))
+        except Exception as e:
+            future.set_exception(e)
+
+        return future
+
+    def get_async(self, url, params=None, headers=None):
+        return self.submit(self.send, 'GET', url, params=params,
+                           headers=headers)
+
+    def close(self):
+        pass
+
+    def after_fork(self):
+        """Called in a forked child before the transport is used. Any state
+        inherited from the parent, such as open sockets, must be dropped.
+        """
+        pass
+
+
+class RequestsTransport(Transport):
+    """The default transport, backed by a requests.Session. Compressed
+    responses are decompressed incrementally by urllib3 as they are read.
+    """
+
+    def __init__(self, pool_maxsize=None):
+        self.pool_maxsize = pool_maxsize
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        # requests is imported and the session created on first use so that
+        # short-lived processes which never make a request don't pay for it
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._new_session()
+
+        return self._session
+
+    def _new_session(self):
+        import requests
+
+        session = requests.Session()
+
+        if self.pool_maxsize:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.pool_maxsize,
+                pool_maxsize=self.pool_maxsize)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+
+        return session
+
+    def send(self, method, url, body=None, params=None, headers=None):
+        response = self.session.request(method=method, url=url, data=body,
+                                        params=params, headers=headers)
+
+        return (response.status_code, response.content)
+
+    def close(self):
+        session = self._session
+        self._session = None
+
+        if session is not None:
+            session.close()
+
+    def after_fork(self):
+        # Drop rather than close the session: the parent still owns the
+        # sockets
+        self._session = None
+        self._lock = threading.Lock()
+
+
+class ThreadPoolMixin(object):
+    """Runs submit() and get_async() on a thread pool of `max_workers`
+    threads, created on first use
+    """
+
+    def __init__(self, max_workers=8, **kwds):
+        super(ThreadPoolMixin, self).__init__(**kwds)
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    from concurrent import futures
+
+                    self._executor = futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers)
+
+        return self._executor
+
+    def submit(self, fn, *args, **kwds):
+        return self.executor.submit(fn, *args, **kwds)
+
+    def close(self):
+        executor = self._executor
+        self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        super(ThreadPoolMixin, self).close()
+
+    def after_fork(self):
+        # The pool's threads don't exist in the child
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        super(ThreadPoolMixin, self).after_fork()
+
+
+class ThreadPoolTransport(ThreadPoolMixin, RequestsTransport):
+    """A requests transport whose submit() and get_async() run on a thread
+    pool. The connection pool is sized to match the number of workers.
+    """
+
+    def __init__(self, max_workers=8, pool_maxsize=None):
+        super(ThreadPoolTransport, self).__init__(
+            max_workers=max_workers, pool_maxsize=pool_maxsize or max_workers)
+
+
+class Http2Transport(ThreadPoolMixin, Transport):
+    """A transport which multiplexes concurrent requests as HTTP/2 streams
+    over a single connection, for servers (or proxies) which support it.
+    This cuts the TLS handshakes and sockets needed to fan out many requests
+    from the thread pool.
+
+    Requires httpx with HTTP/2 support: pip install 'httpx[http2]'. Any other
+    keyword arguments (e.g. verify, timeout) are passed to httpx.Client.
+    """
+
+    def __init__(self, max_workers=32, **client_kwds):
+        super(Http2Transport, self).__init__(max_workers=max_workers)
+        self.client_kwds = client_kwds
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._new_client()
+
+        return self._client
+
+    def _new_client(self):
+        try:
+            import httpx
+            import h2  # noqa: F401
+        except ImportError:
+            raise exc.OpsviewClientException(
+                'HTTP/2 support requires httpx[http2] to be installed')
+
+        return httpx.Client(http2=True, **self.client_kwds)
+
+    def send(self, method, url, body=None, params=None, headers=None):
+        response = self.client.request(method, url, content=body,
+                                       params=params, headers=headers)
+
+        return (response.status_code, response.content)
+
+    def close(self):
+        client = self._client
+        self._client = None
+
+        if client is not None:
+            client.close()
+
+        super(Http2Transport, self).close()
+
+    def after_fork(self):
+        self._client = None
+        self._lock = threading.Lock()
+        super(Http2Transport, self).after_fork()
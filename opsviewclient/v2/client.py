@@ -1,25 +1,53 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-import requests
+import copy
+import os
+import threading
 
-try:
-    import simplejson as json
-except ImportError:
-    import json
+from six.moves.urllib import parse
 
 from opsviewclient import exceptions as exc
+from opsviewclient import reload as reloads
+from opsviewclient import transport as transports
 from opsviewclient.v2.config import Client as ConfigClient
 
 
+def _json():
+    # Imported on first use so that importing the client stays cheap
+    try:
+        import simplejson as json
+    except ImportError:
+        import json
+
+    return json
+
+
+class _Call(object):
+    """An in-flight request which other threads can wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
 class Client(object):
 
     _default_headers = {
         'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
         'Content-Type': 'application/json',
     }
 
-    def __init__(self, endpoint, username=None, password=None, token=None):
+    # Request bodies smaller than this are never compressed
+    default_compress_threshold = 16 * 1024
+
+    def __init__(self, endpoint, username=None, password=None, token=None,
+                 cache=None, coalesce=True, token_cache=None,
+                 pool_maxsize=None, transport=None, compress=None,
+                 compress_threshold=None):
         if endpoint[-1] == '/':
             self.base_url = endpoint
         else:
@@ -30,21 +58,98 @@ class Client(object):
                                              'token or password')
 
         self.token = token
+        self.cache = cache
+        self.coalesce = coalesce
+        self.token_cache = token_cache
+        self.changes = reloads.ChangeTracker()
+        self.compress = compress
+        self.compress_threshold = (compress_threshold
+                                   if compress_threshold is not None
+                                   else Client.default_compress_threshold)
+        self.transport = (transport or
+                          transports.RequestsTransport(pool_maxsize))
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._generation = 0
+        self._auth_lock = threading.Lock()
+        self._authenticated = False
         self._username = username
         self._password = password
 
-        self._session = requests.Session()
-        self._session.headers = Client._default_headers
+        self._headers = dict(Client._default_headers)
+        self._pid = os.getpid()
 
         self.config = ConfigClient(self)
 
-        self._authenticate()
+        # A token given up front is used as-is; otherwise logging in is
+        # deferred until the first request
+        if token and not password:
+            self._set_token(token)
+
+    def _check_fork(self):
+        """Gives a forked child process its own connections and locks.
+
+        Sockets inherited from the parent are shared with it, so using them
+        from both processes corrupts the streams. The child drops (without
+        closing) the inherited connections and opens new ones on its next
+        request, keeping the token so it doesn't need to log in again.
+        """
+        pid = os.getpid()
+        if pid == self._pid:
+            return
+
+        self._pid = pid
+        self.transport.after_fork()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._auth_lock = threading.Lock()
+        self.changes.after_fork()
+
+        if self.cache is not None:
+            self.cache.after_fork()
+
+    def close(self):
+        """Closes the client's connections. The client can still be used
+        afterwards; new connections are opened on the next request.
+        """
+        self.transport.close()
+
+    def _set_token(self, token):
+        self.token = token
+        self._headers['X-Opsview-Username'] = self._username
+        self._headers['X-Opsview-Token'] = token
+        self._authenticated = True
 
-    def _authenticate(self):
-        # Clear the authenticated headers
-        self._session.headers.pop('X-Opsview-Username', None)
-        self._session.headers.pop('X-Opsview-Token', None)
+    def _ensure_authenticated(self):
+        if self._authenticated:
+            return
 
+        with self._auth_lock:
+            if self._authenticated:
+                return
+
+            if self.token_cache is not None:
+                token = self.token_cache.get(self.base_url, self._username)
+                if token:
+                    self._set_token(token)
+                    return
+
+            self._authenticate()
+
+    def _reauthenticate(self, stale_token):
+        """Logs in again after `stale_token` was rejected, unless another
+        thread has already done so
+        """
+        with self._auth_lock:
+            if self.token != stale_token:
+                return
+
+            if self.token_cache is not None:
+                self.token_cache.delete(self.base_url, self._username)
+
+            self._authenticate()
+
+    def _authenticate(self):
         if self._username and self._password:
             payload = {
                 'username': self._username,
@@ -57,10 +162,12 @@ class Client(object):
             except Exception as e:
                 raise e
 
-            self.token = token
+            if self.token_cache is not None:
+                self.token_cache.set(self.base_url, self._username, token)
+        else:
+            token = self.token
 
-        self._session.headers['X-Opsview-Username'] = self._username
-        self._session.headers['X-Opsview-Token'] = self.token
+        self._set_token(token)
 
     def _url(self, path):
         if path[0] == '/':
@@ -68,31 +175,154 @@ class Client(object):
 
         return self.base_url + path
 
+    def _compress(self, data):
+        """Compresses a serialised request body if compression is enabled
+        and the body is large enough. Returns the body and the value for the
+        Content-Encoding header, if any.
+        """
+        if not self.compress or len(data) < self.compress_threshold:
+            return (data, None)
+
+        if self.compress == 'gzip':
+            import gzip
+            import io
+
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6) as f:
+                f.write(data)
+
+            return (buf.getvalue(), 'gzip')
+
+        if self.compress == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                raise exc.OpsviewClientException(
+                    'zstd compression requires zstandard to be installed')
+
+            return (zstandard.ZstdCompressor().compress(data), 'zstd')
+
+        raise exc.OpsviewClientException('Unsupported compression: %s' %
+                                         self.compress)
+
+    def _send(self, method, path, data=None, params=None, encoding=None):
+        headers = self._headers
+        if path in ('login', '/login'):
+            # Never send a (possibly stale) token when logging in
+            headers = dict(Client._default_headers)
+
+        if encoding:
+            headers = dict(headers, **{'Content-Encoding': encoding})
+
+        return self.transport.send(method, self._url(path), body=data,
+                                   params=params, headers=headers)
+
     def _request(self, method, path, data=None, params=None, expected=[200]):
+        self._check_fork()
+
+        login = path in ('login', '/login')
+        if not login:
+            self._ensure_authenticated()
 
+        encoding = None
         if data is not None:
-            data = json.dumps(data)
+            data = _json().dumps(data).encode('utf-8')
+            (data, encoding) = self._compress(data)
+
+        token = self.token
+        (status, content) = self._send(method, path, data=data,
+                                       params=params, encoding=encoding)
+
+        # The token may have expired (or come from a stale cache entry); log
+        # in again and retry once if we can
+        if status == 401 and not login and self._password:
+            self._reauthenticate(token)
+            (status, content) = self._send(method, path, data=data,
+                                           params=params, encoding=encoding)
 
-        response = self._session.request(method=method, url=self._url(path),
-                                         data=data, params=params)
+        content = content.decode('utf-8', 'replace')
 
-        if response.status_code not in expected:
-            raise exc.OpsviewClientException('Unexpected response: ',
-                                             response.text)
+        if status not in expected:
+            if status == 404:
+                raise exc.NotFound('Not found: ', content)
 
-        return response.json()
+            raise exc.OpsviewClientException('Unexpected response: ', content)
+
+        return _json().loads(content)
+
+    def submit(self, fn, *args, **kwds):
+        """Calls `fn` through the transport and returns a
+        concurrent.futures.Future for its result. With a ThreadPoolTransport
+        the call runs on the transport's thread pool.
+        """
+        # A pool inherited over a fork has no threads to run the call
+        self._check_fork()
+        return self.transport.submit(fn, *args, **kwds)
+
+    def get_async(self, url, **kwds):
+        self._check_fork()
+        return self.submit(self.get, url, **kwds)
 
     def get(self, url, **kwds):
-        return self._request('GET', url, **kwds)
+        self._check_fork()
+
+        if not self.coalesce:
+            return self._request('GET', url, **kwds)
+
+        # Concurrent GETs of the same URL and params share a single request.
+        # Every caller gets its own copy of the response as resources decode
+        # their info in place. Writes start a new generation, so a GET made
+        # after a write never shares a request started before it.
+        params = kwds.get('params') or {}
+
+        with self._inflight_lock:
+            key = (self._generation, url,
+                   parse.urlencode(sorted(params.items()), doseq=True))
+            call = self._inflight.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._inflight[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = self._request('GET', url, **kwds)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+                shared = call.waiters > 0
+
+            call.event.set()
+
+        return copy.deepcopy(call.result) if shared else call.result
+
+    def _write(self, method, url, **kwds):
+        try:
+            return self._request(method, url, **kwds)
+        finally:
+            # Even a failed write may have changed something on the server
+            with self._inflight_lock:
+                self._generation += 1
 
     def post(self, url, **kwds):
-        return self._request('POST', url, **kwds)
+        return self._write('POST', url, **kwds)
 
     def put(self, url, **kwds):
-        return self._request('PUT', url, **kwds)
+        return self._write('PUT', url, **kwds)
 
     def delete(self, url, **kwds):
-        return self._request('DELETE', url, **kwds)
+        return self._write('DELETE', url, **kwds)
 
     def reload(self, asynchronous=False):
         params = {}
@@ -101,6 +331,12 @@ class Client(object):
 
         return self.post('/reload', params=params)
 
+    def pending_changes(self):
+        """Returns {resource type: number of uncommitted objects} for each
+        type this client has changed since the last reload
+        """
+        return self.changes.pending(self)
+
     def reload_status(self):
         return self.get('/reload')
 
@@ -98,17 +98,7 @@ class Attribute(base.Resource):
 
     @property
     def service_checks(self):
-        if not self._info.get('servicechecks'):
-            return
-
-        if not self.manager:
-            for check in self._info['servicechecks']:
-                yield check
-
-        else:
-            for check in self._info['servicechecks']:
-                check_id = base.id_from_ref(check)
-                yield self.manager.client.config.servicechecks.get(check_id)
+        return self._ref_list('servicechecks', 'servicechecks')
 
     def __repr__(self):
         return '<Attribute: %s>' % self.name
@@ -117,6 +107,7 @@ class Attribute(base.Resource):
 class AttributeManager(base.Manager):
 
     resource_class = Attribute
+    resource_type = 'attribute'
 
     def get(self, attribute):
         return self._get('/config/attribute/%s' % base.get_id(attribute))
@@ -197,7 +188,7 @@ class AttributeManager(base.Manager):
                             body=body, params=params)
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -220,4 +211,4 @@ class AttributeManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/attribute%s' % qstring)
+        return self._list('/config/attribute%s' % qstring, prefetch=prefetch)
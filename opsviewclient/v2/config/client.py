@@ -1,53 +1,62 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-from opsviewclient.v2.config import attributes
-from opsviewclient.v2.config import collectors
-from opsviewclient.v2.config import contacts
-from opsviewclient.v2.config import hostcheckcommands
-from opsviewclient.v2.config import hostgroups
-from opsviewclient.v2.config import hosttemplates
-from opsviewclient.v2.config import hosts
-from opsviewclient.v2.config import keywords
-from opsviewclient.v2.config import monitoringclusters
-from opsviewclient.v2.config import monitoringservers
-from opsviewclient.v2.config import netflowcollectors
-from opsviewclient.v2.config import netflowsources
-from opsviewclient.v2.config import notificationmethods
-from opsviewclient.v2.config import roles
-from opsviewclient.v2.config import servicechecks
-from opsviewclient.v2.config import servicegroups
-from opsviewclient.v2.config import sharednotificationprofiles
-from opsviewclient.v2.config import tenancies
-from opsviewclient.v2.config import timeperiods
+import importlib
+
+
+# Manager attribute name -> manager class. Each manager lives in the module
+# of the same name as its attribute, e.g. opsviewclient.v2.config.hosts.
+_managers_ = {
+    'attributes': 'AttributeManager',
+    'collectors': 'CollectorManager',
+    'contacts': 'ContactManager',
+    'hostcheckcommands': 'HostCheckCommandManager',
+    'hostgroups': 'HostGroupManager',
+    'hosttemplates': 'HostTemplateManager',
+    'hosts': 'HostManager',
+    'keywords': 'KeywordManager',
+    'monitoringclusters': 'MonitoringClusterManager',
+    'monitoringservers': 'MonitoringServerManager',
+    'netflowcollectors': 'NetflowCollectorManager',
+    'netflowsources': 'NetflowSourceManager',
+    'notificationmethods': 'NotificationMethodManager',
+    'roles': 'RoleManager',
+    'servicechecks': 'ServiceCheckManager',
+    'servicegroups': 'ServiceGroupManager',
+    'sharednotificationprofiles': 'SharedNotificationProfileManager',
+    'tenancies': 'TenancyManager',
+    'timeperiods': 'TimePeriodManager',
+}
 
 
 class Client(object):
+    """Gives access to the configuration managers. Each manager, and the
+    module it is defined in, is only loaded the first time it is used.
+    """
 
     def __init__(self, api):
         self._api = api
-        self.attributes = attributes.AttributeManager(api)
-        self.collectors = collectors.CollectorManager(api)
-        self.contacts = contacts.ContactManager(api)
-        self.hostcheckcommands = hostcheckcommands.HostCheckCommandManager(api)
-        self.hostgroups = hostgroups.HostGroupManager(api)
-        self.hosttemplates = hosttemplates.HostTemplateManager(api)
-        self.hosts = hosts.HostManager(api)
-        self.keywords = keywords.KeywordManager(api)
-        self.monitoringservers = monitoringservers.MonitoringServerManager(api)
-        self.monitoringclusters = \
-            monitoringclusters.MonitoringClusterManager(api)
-
-        self.netflowcollectors = netflowcollectors.NetflowCollectorManager(api)
-        self.netflowsources = netflowsources.NetflowSourceManager(api)
-        self.notificationmethods = \
-            notificationmethods.NotificationMethodManager(api)
-
-        self.roles = roles.RoleManager(api)
-        self.servicechecks = servicechecks.ServiceCheckManager(api)
-        self.servicegroups = servicegroups.ServiceGroupManager(api)
-        self.sharednotificationprofiles = \
-            sharednotificationprofiles.SharedNotificationProfileManager(api)
-
-        self.tenancies = tenancies.TenancyManager(api)
-        self.timeperiods = timeperiods.TimePeriodManager(api)
+
+    def __getattr__(self, name):
+        try:
+            class_name = _managers_[name]
+        except KeyError:
+            raise AttributeError(name)
+
+        module = importlib.import_module('opsviewclient.v2.config.' + name)
+        manager = getattr(module, class_name)(self._api)
+
+        # Cache the manager so that later lookups don't come back here
+        self.__dict__[name] = manager
+        return manager
+
+    def __dir__(self):
+        return sorted(set(dir(self.__class__)) | set(self.__dict__) |
+                      set(_managers_))
+
+    def managers(self):
+        """Returns a dictionary of resource type (as it appears in API refs) to
+        the manager for that type
+        """
+        managers = (getattr(self, name) for name in sorted(_managers_))
+        return dict((m.resource_type, m) for m in managers)
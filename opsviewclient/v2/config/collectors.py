@@ -57,25 +57,11 @@ class Collector(base.Resource):
 
     @property
     def monitoring_cluster(self):
-        if not self._info.get('monitoringcluster'):
-            return
-
-        if not self.manager:
-            return self._info['monitoringcluster']
-
-        mc_id = base.id_from_ref(self._info['monitoringcluster'])
-        return self.manager.client.config.monitoringclusters.get(mc_id)
+        return self._ref('monitoringcluster', 'monitoringclusters')
 
     @property
     def host(self):
-        if not self._info.get('host'):
-            return
-
-        if not self.manager:
-            return self._info['host']
-
-        h_id = base.id_from_ref(self._info['host'])
-        return self.manager.client.config.hosts.get(h_id)
+        return self._ref('host', 'hosts')
 
     def __repr__(self):
         return '<Collector: %s>' % self.name
@@ -84,6 +70,7 @@ class Collector(base.Resource):
 class CollectorManager(base.Manager):
 
     resource_class = Collector
+    resource_type = 'collector'
 
     def get(self, collector):
         return self._get('/config/collector/%s' % base.get_id(collector))
@@ -119,7 +106,7 @@ class CollectorManager(base.Manager):
                             body=body, params=params)
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -142,4 +129,4 @@ class CollectorManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/collector%s' % qstring)
+        return self._list('/config/collector%s' % qstring, prefetch=prefetch)
@@ -140,31 +140,12 @@ class Contact(base.Resource):
 
     @property
     def shared_notification_profiles(self):
-        if not self._info.get('sharednotificationprofiles'):
-            return
-
-        if not self.manager:
-            for profile in self._info['sharednotificationprofiles']:
-                yield profile
-
-        else:
-            for profile in self._info['sharednotificationprofiles']:
-                profile_id = base.id_from_ref(profile)
-                yield self.manager.client.config.sharednotificationprofiles.get(
-                    profile_id
-                )
+        return self._ref_list('sharednotificationprofiles',
+                              'sharednotificationprofiles')
 
     @property
     def role(self):
-        if not self._info.get('role'):
-            return
-
-        # Return the proper role object via an API request
-        if not self.manager:
-            return self._info['role']
-
-        role_id = base.id_from_ref(self._info['role'])
-        return self.manager.client.config.roles.get(role_id)
+        return self._ref('role', 'roles')
 
     def __repr__(self):
         return '<Contact: %s>' % self.name
@@ -176,6 +157,7 @@ class Contact(base.Resource):
 class ContactManager(base.Manager):
 
     resource_class = Contact
+    resource_type = 'contact'
 
     def create(self, name, description=None, password=None,
                encrypted_password=None, full_name=None, language=None,
@@ -287,7 +269,7 @@ class ContactManager(base.Manager):
         return self._delete('/config/contact/%s' % base.get_id(contact))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -310,4 +292,4 @@ class ContactManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/contact%s' % qstring)
+        return self._list('/config/contact%s' % qstring, prefetch=prefetch)
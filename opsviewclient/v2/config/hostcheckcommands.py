@@ -60,16 +60,7 @@ class HostCheckCommand(base.Resource):
 
     @property
     def hosts(self):
-        if not self._info.get('hosts'):
-            return
-
-        if not self.manager:
-            for host in self._info['hosts']:
-                yield host
-        else:
-            for host in self._info['hosts']:
-                host_id = base.id_from_ref(host)
-                yield self.manager.client.config.hosts.get(host_id)
+        return self._ref_list('hosts', 'hosts')
 
     def delete(self):
         return self.manager.delete(self)
@@ -78,6 +69,8 @@ class HostCheckCommand(base.Resource):
 class HostCheckCommandManager(base.Manager):
 
     resource_class = HostCheckCommand
+    resource_type = 'hostcheckcommand'
+    cache_ttl = 3600
 
     def get(self, command):
         return self._get('/config/hostcheckcommand/%s' % base.get_id(command))
@@ -142,7 +135,7 @@ class HostCheckCommandManager(base.Manager):
                             base.get_id(command))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -165,4 +158,5 @@ class HostCheckCommandManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/hostcheckcommand%s' % qstring)
+        return self._list('/config/hostcheckcommand%s' % qstring,
+                          prefetch=prefetch)
@@ -73,48 +73,216 @@ class HostGroup(base.Resource):
 
     @property
     def children(self):
-        if not self._info.get('children'):
-            return
-
-        if not self.manager:
-            for hg in self._info['children']:
-                yield hg
-        else:
-            for hg in self._info['children']:
-                hg_id = base.id_from_ref(hg)
-                yield self.manager.client.config.hostgroups.get(hg_id)
+        return self._ref_list('children', 'hostgroups')
 
     @property
     def hosts(self):
-        if not self._info.get('hosts'):
-            return
-
-        if not self.manager:
-            for h in self._info['hosts']:
-                yield h
-        else:
-            for h in self._info['hosts']:
-                h_id = base.id_from_ref(h)
-                yield self.manager.client.config.hosts.get(h_id)
+        return self._ref_list('hosts', 'hosts')
 
     @property
     def parent(self):
-        if not self._info.get('parent'):
-            return
-
-        if not self.manager:
-            return self._info['parent']
-
-        hg_id = base.id_from_ref(self._info['parent'])
-        return self.manager.client.config.hostgroups.get(hg_id)
+        return self._ref('parent', 'hostgroups')
 
     def delete(self):
         return self.manager.delete(self)
 
 
+def parent_matpath(matpath):
+    """Returns the matpath of a host group's parent, e.g. 'Opsview,a,' for
+    'Opsview,a,b,', or None for the root group
+    """
+    path = matpath.rstrip(',')
+    if ',' not in path:
+        return None
+
+    return path.rsplit(',', 1)[0] + ','
+
+
+class HostGroupTree(object):
+    """An in-memory index of the host group hierarchy.
+
+    The tree is built from the `matpath` of each group so that a single
+    HostGroupManager.list() is enough to answer parent, ancestor, depth and
+    subtree queries without any further API calls. Groups can be added,
+    moved or removed incrementally with update(), remove() and refresh().
+    """
+
+    def __init__(self, groups=(), manager=None):
+        self.manager = manager
+        self._groups = {}
+        self._by_matpath = {}
+        self._parent = {}
+        self._children = {}
+
+        # parent matpath -> ids of the groups waiting for that parent to be
+        # added, so that they can be attached whichever comes first
+        self._orphans = {}
+
+        # Indexing parents first saves their children waiting as orphans
+        for group in sorted(groups, key=lambda g: g.matpath.count(',')):
+            self.update(group)
+
+    def __len__(self):
+        return len(self._groups)
+
+    def __contains__(self, group):
+        return self._id(group) in self._groups
+
+    def __iter__(self):
+        return six.itervalues(self._groups)
+
+    @staticmethod
+    def _id(group):
+        return int(base.get_id(group))
+
+    def get(self, group):
+        return self._groups.get(self._id(group))
+
+    def get_by_matpath(self, matpath):
+        group_id = self._by_matpath.get(matpath)
+        return self._groups.get(group_id)
+
+    def roots(self):
+        return [self._groups[i] for (i, p) in six.iteritems(self._parent)
+                if p is None]
+
+    def parent(self, group):
+        parent_id = self._parent.get(self._id(group))
+        return self._groups.get(parent_id)
+
+    def children(self, group):
+        return [self._groups[i]
+                for i in self._children.get(self._id(group), ())]
+
+    def ancestors(self, group):
+        """Returns the ancestors of a group, nearest first"""
+        result = []
+        parent_id = self._parent.get(self._id(group))
+
+        while parent_id is not None:
+            result.append(self._groups[parent_id])
+            parent_id = self._parent.get(parent_id)
+
+        return result
+
+    def depth(self, group):
+        """Returns the depth of a group, where the root group is at depth 0"""
+        return self._groups[self._id(group)].matpath.count(',') - 1
+
+    def subtree(self, group, include_self=True):
+        """Yields every group below `group` (depth first)"""
+        group_id = self._id(group)
+        stack = [group_id] if include_self else \
+            list(self._children.get(group_id, ()))
+
+        while stack:
+            current = stack.pop()
+            yield self._groups[current]
+            stack.extend(self._children.get(current, ()))
+
+    def hosts(self, group):
+        """Yields the host refs of every group in the subtree of `group`"""
+        for hg in self.subtree(group):
+            for host in hg._info.get('hosts') or ():
+                yield host
+
+    def update(self, group):
+        """Adds a group to the tree or replaces an existing one. If the
+        group has moved, the matpaths of its descendants are rewritten to
+        match.
+        """
+        group_id = self._id(group)
+        matpath = group.matpath
+        old = self._groups.get(group_id)
+
+        if old is not None:
+            old_matpath = old.matpath
+            self._detach(group_id)
+            del self._by_matpath[old_matpath]
+
+            if old_matpath != matpath:
+                for child in list(self.subtree(group_id,
+                                               include_self=False)):
+                    child_path = child.matpath
+                    del self._by_matpath[child_path]
+                    child._info['matpath'] = \
+                        matpath + child_path[len(old_matpath):]
+                    self._by_matpath[child._info['matpath']] = self._id(child)
+                    self._adopt(child._info['matpath'])
+
+        self._groups[group_id] = group
+        self._by_matpath[matpath] = group_id
+        self._children.setdefault(group_id, set())
+        self._attach(group_id, matpath)
+        self._adopt(matpath)
+
+    def remove(self, group):
+        """Removes a group and its subtree from the tree"""
+        group_id = self._id(group)
+        if group_id not in self._groups:
+            return
+
+        self._detach(group_id)
+        for hg in list(self.subtree(group_id)):
+            hg_id = self._id(hg)
+            self._discard_orphan(hg_id, hg.matpath)
+            del self._by_matpath[hg.matpath]
+            del self._groups[hg_id]
+            del self._parent[hg_id]
+            del self._children[hg_id]
+
+    def refresh(self, groups):
+        """Re-fetches the given groups with a single list request and updates
+        the tree with them. Groups which no longer exist are removed.
+        """
+        ids = [self._id(g) for g in groups]
+        if not ids:
+            return
+
+        fetched = self.manager.list(search={'id': {'-in': ids}})
+        for group in sorted(fetched, key=lambda g: g.matpath.count(',')):
+            self.update(group)
+
+        found = set(self._id(g) for g in fetched)
+        for group_id in ids:
+            if group_id not in found:
+                self.remove(group_id)
+
+    def _attach(self, group_id, matpath):
+        # Groups whose parent isn't in the tree (yet) wait as orphans
+        parent_path = parent_matpath(matpath)
+        parent_id = self._by_matpath.get(parent_path)
+        self._parent[group_id] = parent_id
+
+        if parent_id is not None:
+            self._children.setdefault(parent_id, set()).add(group_id)
+        elif parent_path is not None:
+            self._orphans.setdefault(parent_path, set()).add(group_id)
+
+    def _adopt(self, matpath):
+        for orphan_id in self._orphans.pop(matpath, ()):
+            self._attach(orphan_id, self._groups[orphan_id].matpath)
+
+    def _detach(self, group_id):
+        parent_id = self._parent.get(group_id)
+        if parent_id is not None:
+            self._children[parent_id].discard(group_id)
+        elif group_id in self._groups:
+            self._discard_orphan(group_id, self._groups[group_id].matpath)
+
+    def _discard_orphan(self, group_id, matpath):
+        parent_path = parent_matpath(matpath)
+        orphans = self._orphans.get(parent_path)
+        if orphans is not None:
+            orphans.discard(group_id)
+            if not orphans:
+                del self._orphans[parent_path]
+
+
 class HostGroupManager(base.Manager):
 
     resource_class = HostGroup
+    resource_type = 'hostgroup'
 
     def get(self, group):
         return self._get('/config/hostgroup/%s' % base.get_id(group))
@@ -184,7 +352,7 @@ class HostGroupManager(base.Manager):
         return self._delete('/config/hostgroup/%s' % base.get_id(group))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -207,4 +375,8 @@ class HostGroupManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/hostgroup%s' % qstring)
+        return self._list('/config/hostgroup%s' % qstring, prefetch=prefetch)
+
+    def tree(self, **kwds):
+        """Returns a HostGroupTree built from a single list request"""
+        return HostGroupTree(self.list(**kwds), manager=self)
@@ -219,110 +219,39 @@ class Host(base.Resource):
 
     @property
     def keywords(self):
-        if not self._info.get('keywords'):
-            return
-
-        if not self.manager:
-            for k in self._info['keywords']:
-                yield k
-        else:
-            for k in self._info['keywords']:
-                k_id = base.id_from_ref(k)
-                yield self.manager.client.config.keywords.get(k_id)
+        return self._ref_list('keywords', 'keywords')
 
     @property
     def check_command(self):
-        if not self._info.get('check_command'):
-            return
-
-        if not self.manager:
-            return self._info['check_command']
-
-        check_id = base.id_from_ref(self._info['check_command'])
-        return self.manager.client.config.hostcheckcommands.get(check_id)
+        return self._ref('check_command', 'hostcheckcommands')
 
     @property
     def check_period(self):
-        if not self._info.get('check_period'):
-            return
-
-        if not self.manager:
-            return self._info['check_period']
-
-        period_id = base.id_from_ref(self._info['check_period'])
-        return self.manager.client.config.timeperiods.get(period_id)
+        return self._ref('check_period', 'timeperiods')
 
     @property
     def host_group(self):
-        if not self._info.get('hostgroup'):
-            return
-
-        if not self.manager:
-            return self._info['hostgroup']
-
-        hg_id = base.id_from_ref(self._info['hostgroup'])
-        return self.manager.client.config.hostgroups.get(hg_id)
+        return self._ref('hostgroup', 'hostgroups')
 
     @property
     def host_templates(self):
-        if not self._info.get('hosttemplates'):
-            return
-
-        if not self.manager:
-            for ht in self._info['hosttemplates']:
-                yield ht
-        else:
-            for ht in self._info['hosttemplates']:
-                ht_id = base.id_from_ref(ht)
-                yield self.manager.client.config.hosttemplates.get(ht_id)
+        return self._ref_list('hosttemplates', 'hosttemplates')
 
     @property
     def service_checks(self):
-        if not self._info.get('servicechecks'):
-            return
-
-        if not self.manager:
-            for sc in self._info['servicechecks']:
-                yield sc
-        else:
-            for sc in self._info['servicechecks']:
-                sc_id = base.id_from_ref(sc)
-                yield self.manager.client.config.servicechecks.get(sc_id)
+        return self._ref_list('servicechecks', 'servicechecks')
 
     @property
     def parents(self):
-        if not self._info.get('parents'):
-            return
-
-        if not self.manager:
-            for h in self._info['parents']:
-                yield h
-        else:
-            for h in self._info['parents']:
-                h_id = base.id_from_ref(h)
-                yield self.manager.client.config.hosts.get(h_id)
+        return self._ref_list('parents', 'hosts')
 
     @property
     def notification_period(self):
-        if not self._info.get('notification_period'):
-            return
-
-        if not self.manager:
-            return self._info['notification_period']
-
-        period_id = base.id_from_ref(self._info['notification_period'])
-        return self.manager.client.config.timeperiods.get(period_id)
+        return self._ref('notification_period', 'timeperiods')
 
     @property
     def monitored_by(self):
-        if not self._info.get('monitored_by'):
-            return
-
-        if not self.manager:
-            return self._info['monitored_by']
-
-        mon_id = base.id_from_ref(self._info['monitored_by'])
-        return self.manager.client.config.monitoringservers.get(mon_id)
+        return self._ref('monitored_by', 'monitoringservers')
 
     def delete(self):
         return self.manager.delete(self)
@@ -331,6 +260,8 @@ class Host(base.Resource):
 class HostManager(base.Manager):
 
     resource_class = Host
+    resource_type = 'host'
+    cache_ttl = 30
 
     def get(self, host, params=None):
         return self._get('/config/host/%s' % base.get_id(host),
@@ -630,7 +561,7 @@ class HostManager(base.Manager):
              search=None, in_use=None, is_parent=None, include_ms=None,
              include_encrypted=None, monitored_by_id=None, template_id=None,
              template_name=None, bsm_component_id=None, with_snmpifs=False,
-             kwds=None):
+             kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -670,9 +601,72 @@ class HostManager(base.Manager):
             qparams.update(kwds)
 
         qparams = sorted(qparams.items(), key=lambda x: x[0])
-        qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
-
-        return self._list('/config/host%s' % qstring)
+        qstring = "?%s" % parse.urlencode(qparams, doseq=True) \
+            if qparams else ""
+
+        return self._list('/config/host%s' % qstring, prefetch=prefetch)
+
+    # The most host group ids to send in one sharded_list() request
+    hostgroup_chunk_size = 100
+
+    def sharded_list(self, shards=4, search=None, by='id', **kwds):
+        """As Manager.sharded_list(), but with by='hostgroup' the hosts are
+        split between the shards by the top level host groups they are in
+        rather than by id
+        """
+        if by == 'id':
+            return super(HostManager, self).sharded_list(
+                shards=shards, search=search, **kwds)
+
+        if by != 'hostgroup':
+            raise ValueError('Unknown shard type: %s' % by)
+
+        kwds = self._id_order_kwds('sharded_list', kwds, ('page', 'order'))
+
+        # Each shard's groups are requested in chunks to keep the query
+        # strings well within URL length limits
+        size = self.hostgroup_chunk_size
+        chunks = [ids[i:i + size]
+                  for ids in self._hostgroup_shards(shards)
+                  for i in range(0, len(ids), size)]
+
+        return self._fetch_shards(
+            [{'search': search, 'kwds': {'s.hostgroup.id': chunk}}
+             for chunk in chunks],
+            **kwds)
+
+    def _hostgroup_shards(self, shards):
+        """Splits the host group tree into `shards` lists of host group ids.
+
+        Each top level group (a child of a root group) goes to a single
+        shard along with its whole subtree, so the shards are disjoint.
+        Groups are weighted by the number of hosts in them, and the
+        heaviest are placed first on the lightest shard. Groups known to
+        have no hosts are left out.
+        """
+        tree = self.api.config.hostgroups.tree()
+
+        units = []
+        for root in tree.roots():
+            tops = tree.children(root)
+            units.append([root])
+            for top in tops:
+                units.append(list(tree.subtree(top)))
+
+        weighted = sorted(
+            ((sum(len(hg._info.get('hosts') or ()) for hg in unit), unit)
+             for unit in units),
+            key=lambda wu: -wu[0])
+
+        bins = [[0, []] for _ in range(max(1, min(shards, len(units))))]
+        for (weight, unit) in weighted:
+            lightest = min(bins, key=lambda b: b[0])
+            lightest[0] += weight
+            lightest[1].extend(int(hg._info['id']) for hg in unit
+                               if hg._info.get('hosts') is None or
+                               hg._info['hosts'])
+
+        return [sorted(ids) for (_, ids) in bins if ids]
 
     def create_many(self, _list, params=None):
         if isinstance(_list, list):
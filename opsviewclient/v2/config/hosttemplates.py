@@ -97,29 +97,11 @@ class HostTemplate(base.Resource):
 
     @property
     def hosts(self):
-        if not self._info.get('hosts'):
-            return
-
-        if not self.manager:
-            for h in self._info['hosts']:
-                yield h
-        else:
-            for h in self._info['hosts']:
-                h_id = base.id_from_ref(h)
-                yield self.manager.client.config.hosts.get(h_id)
+        return self._ref_list('hosts', 'hosts')
 
     @property
     def service_checks(self):
-        if not self._info.get('servicechecks'):
-            return
-
-        if not self.manager:
-            for sc in self._info['servicechecks']:
-                yield sc
-        else:
-            for sc in self._info['servicechecks']:
-                sc_id = base.id_from_ref(sc)
-                yield self.manager.client.config.servicechecks.get(sc_id)
+        return self._ref_list('servicechecks', 'servicechecks')
 
     def delete(self):
         return self.manager.delete(self)
@@ -128,6 +110,7 @@ class HostTemplate(base.Resource):
 class HostTemplateManager(base.Manager):
 
     resource_class = HostTemplate
+    resource_type = 'hosttemplate'
 
     def get(self, template):
         return self._get('/config/hosttemplate/%s' % base.get_id(template))
@@ -248,7 +231,7 @@ class HostTemplateManager(base.Manager):
         return self._delete('/config/hosttemplate/%s' % base.get_id(template))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -271,4 +254,5 @@ class HostTemplateManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/hosttemplate%s' % qstring)
+        return self._list('/config/hosttemplate%s' % qstring,
+                          prefetch=prefetch)
@@ -89,29 +89,11 @@ class Keyword(base.Resource):
 
     @property
     def hosts(self):
-        if not self._info.get('hosts'):
-            return
-
-        if not self.manager:
-            for h in self._info['hosts']:
-                yield h
-        else:
-            for h in self._info['hosts']:
-                h_id = base.id_from_ref(h)
-                yield self.manager.client.config.hosts.get(h_id)
+        return self._ref_list('hosts', 'hosts')
 
     @property
     def service_checks(self):
-        if not self._info.get('servicechecks'):
-            return
-
-        if not self.manager:
-            for sc in self._info['servicechecks']:
-                yield sc
-        else:
-            for sc in self._info['servicechecks']:
-                sc_id = base.id_from_ref(sc)
-                yield self.manager.client.config.servicechecks.get(sc_id)
+        return self._ref_list('servicechecks', 'servicechecks')
 
     def __repr__(self):
         return '<Keyword: %s>' % self.name
@@ -123,6 +105,7 @@ class Keyword(base.Resource):
 class KeywordManager(base.Manager):
 
     resource_class = Keyword
+    resource_type = 'keyword'
 
     def get(self, keyword):
         return self._get('/config/keyword/%s' % base.get_id(keyword))
@@ -212,7 +195,7 @@ class KeywordManager(base.Manager):
         return self._delete('/config/keyword/%s' % base.get_id(keyword))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -235,4 +218,4 @@ class KeywordManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/keyword%s' % qstring)
+        return self._list('/config/keyword%s' % qstring, prefetch=prefetch)
@@ -51,44 +51,15 @@ class MonitoringCluster(base.Resource):
 
     @property
     def collectors(self):
-        if not self._info.get('collectors'):
-            return
-
-        if not self.manager:
-            for c in self._info['collectors']:
-                yield c
-        else:
-            for c in self._info['collectors']:
-                c_id = base.id_from_ref(hg)
-                yield self.manager.client.config.collectors.get(hg_id)
+        return self._ref_list('collectors', 'collectors')
 
     @property
     def monitors(self):
-        if not self._info.get('monitors'):
-            return
-
-        if not self.manager:
-            for m in self._info['monitors']:
-                yield m
-
-        else:
-            for m in self._info['monitors']:
-                m_id = base.id_from_ref(m)
-                yield self.manager.client.config.hosts.get(m_id)
+        return self._ref_list('monitors', 'hosts')
 
     @property
     def roles(self):
-        if not self._info.get('roles'):
-            return
-
-        if not self.manager:
-            for r in self._info['roles']:
-                yield r
-
-        else:
-            for r in self._info['roles']:
-                r_id = base.id_from_ref(r)
-                yield self.manager.client.config.roles.get(r_id)
+        return self._ref_list('roles', 'roles')
 
     def delete(self):
         return self.manager.delete(self)
@@ -97,6 +68,7 @@ class MonitoringCluster(base.Resource):
 class MonitoringClusterManager(base.Manager):
 
     resource_class = MonitoringCluster
+    resource_type = 'monitoringcluster'
 
     def get(self, cluster):
         return self._get('/config/monitoringcluster/%s' % base.get_id(cluster))
@@ -166,7 +138,7 @@ class MonitoringClusterManager(base.Manager):
                             base.get_id(cluster))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -189,4 +161,5 @@ class MonitoringClusterManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/monitoringcluster%s' % qstring)
+        return self._list('/config/monitoringcluster%s' % qstring,
+                          prefetch=prefetch)
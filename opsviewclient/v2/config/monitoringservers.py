@@ -47,16 +47,7 @@ class MonitoringServer(base.Resource):
 
     @property
     def monitors(self):
-        if not self._info.get('monitors'):
-            return
-
-        if not self.manager:
-            for h in self._info['monitors']:
-                yield h
-        else:
-            for h in self._info['monitors']:
-                h_id = base.id_from_ref(h)
-                yield self.manager.client.config.hosts.get(h_id)
+        return self._ref_list('monitors', 'hosts')
 
     # TODO(jg): find some clever way to get the host ref
     @property
@@ -69,16 +60,7 @@ class MonitoringServer(base.Resource):
 
     @property
     def roles(self):
-        if not self._info.get('roles'):
-            return
-
-        if not self.manager:
-            for r in self._info['roles']:
-                yield r
-        else:
-            for r in self._info['roles']:
-                r_id = base.id_from_ref(r)
-                yield self.manager.client.config.roles.get(r_id)
+        return self._ref_list('roles', 'roles')
 
     def __repr__(self):
         return '<MonitoringServer: %s>' % self.name
@@ -93,6 +75,7 @@ class MonitoringServer(base.Resource):
 class MonitoringServerManager(base.Manager):
 
     resource_class = MonitoringServer
+    resource_type = 'monitoringserver'
 
     def get(self, server):
         return self._get('/config/monitoringserver/%s' % base.get_id(server))
@@ -161,7 +144,7 @@ class MonitoringServerManager(base.Manager):
                             params=params, body=body)
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -184,4 +167,5 @@ class MonitoringServerManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/monitoringserver%s' % qstring)
+        return self._list('/config/monitoringserver%s' % qstring,
+                          prefetch=prefetch)
@@ -24,6 +24,7 @@ class NetflowCollector(base.Resource):
 class NetflowCollectorManager(base.Manager):
 
     resource_class = NetflowCollector
+    resource_type = 'netflowcollector'
 
     def get(self, collector):
         return self._get('/config/netflowcollector/%s' % base.get_id(collector))
@@ -32,7 +33,7 @@ class NetflowCollectorManager(base.Manager):
         return self._delete('/config/netflowcollector/%s' % base.get_id(collector))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -55,4 +56,5 @@ class NetflowCollectorManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/netflowcollector%s' % qstring)
+        return self._list('/config/netflowcollector%s' % qstring,
+                          prefetch=prefetch)
@@ -23,6 +23,7 @@ class NetflowSource(base.Resource):
 class NetflowSourceManager(base.Manager):
 
     resource_class = NetflowSource
+    resource_type = 'netflowsource'
 
     def get(self, source):
         return self._get('/config/netflowsource/%s' % base.get_id(source))
@@ -31,7 +32,7 @@ class NetflowSourceManager(base.Manager):
         return self._delete('/config/netflowsource/%s' % base.get_id(source))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -54,4 +55,5 @@ class NetflowSourceManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/netflowsource%s' % qstring)
+        return self._list('/config/netflowsource%s' % qstring,
+                          prefetch=prefetch)
@@ -91,19 +91,8 @@ class NotificationMethod(base.Resource):
 
     @property
     def shared_notification_profiles(self):
-        if not self._info.get('sharednotificationprofiles'):
-            return
-
-        if not self.manager:
-            for profile in self._info['sharednotificationprofiles']:
-                yield profile
-
-        else:
-            for profile in self._info['sharednotificationprofiles']:
-                profile_id = base.id_from_ref(profile)
-                yield self.manager.client.config.sharednotificationprofiles.get(
-                    profile_id
-                )
+        return self._ref_list('sharednotificationprofiles',
+                              'sharednotificationprofiles')
 
     def __repr__(self):
         return '<NotificationMethod: %s>' % self.name
@@ -115,6 +104,7 @@ class NotificationMethod(base.Resource):
 class NotificationMethodManager(base.Manager):
 
     resource_class = NotificationMethod
+    resource_type = 'notificationmethod'
 
     def get(self, method):
         return self._get('/config/notificationmethod/%s' % base.get_id(method))
@@ -206,7 +196,7 @@ class NotificationMethodManager(base.Manager):
                             base.get_id(method))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -229,4 +219,5 @@ class NotificationMethodManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/notificationmethod%s' % qstring)
+        return self._list('/config/notificationmethod%s' % qstring,
+                          prefetch=prefetch)
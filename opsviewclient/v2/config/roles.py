@@ -105,87 +105,23 @@ class Role(base.Resource):
 
     @property
     def host_groups(self):
-        if not self._info.get('hostgroups'):
-            return
-
-        if not self.manager:
-            for hg in self._info['hostgroups']:
-                yield hg
-
-        else:
-            for hg in self._info['hostgroups']:
-                hg_id = base.id_from_ref(hg)
-                yield self.manager.client.hostgroups.get(hg_id)
+        return self._ref_list('hostgroups', 'hostgroups')
 
     @property
     def keywords(self):
-        if not self._info.get('keywords'):
-            return
-
-        if not self.manager:
-            for kw in self._info['keywords']:
-                yield kw
-
-        else:
-            for kw in self._info['keywords']:
-                kw_id = base.id_from_ref(kw)
-                yield self.manager.client.keywords.get(kw_id)
+        return self._ref_list('keywords', 'keywords')
 
     @property
     def service_groups(self):
-        if not self._info.get('servicegroups'):
-            return
-
-        if not self.manager:
-            for sg in self._info['servicegroups']:
-                yield sg
-
-        else:
-            for sg in self._info['servicegroups']:
-                sg_id = base.id_from_ref(sg)
-                yield self.manager.client.servicegroups.get(sg_id)
+        return self._ref_list('servicegroups', 'servicegroups')
 
     @property
     def contacts(self):
-        if not self._info.get('contacts'):
-            return
-
-        if not self.manager:
-            for c in self._info['contacts']:
-                yield c
-
-        else:
-            for c in self._info['contacts']:
-                c_id = base.id_from_ref(sc)
-                yield self.manager.client.contacts.get(sc_id)
-
-    @property
-    def host_groups(self):
-        if not self._info.get('servicegroups'):
-            return
-
-        if not self.manager:
-            for sg in self._info['servicegroups']:
-                yield sg
-
-        else:
-            for sg in self._info['servicegroups']:
-                sg_id = base.id_from_ref(sg)
-                yield self.manager.client.servicegroups.get(sg_id)
+        return self._ref_list('contacts', 'contacts')
 
     @property
     def monitoring_servers(self):
-        if not self._info.get('servicegroups'):
-            return
-
-        if not self.manager:
-            for sg in self._info['servicegroups']:
-                yield sg
-
-        else:
-            for sg in self._info['servicegroups']:
-                sg_id = base.id_from_ref(sg)
-                yield self.manager.client.servicegroups.get(sg_id)
+        return self._ref_list('monitoringservers', 'monitoringservers')
 
     @property
     def tenancy(self):
@@ -201,6 +137,7 @@ class Role(base.Resource):
 class RoleManager(base.Manager):
 
     resource_class = Role
+    resource_type = 'role'
 
     def create(self, name, description=None, permissions=None,
                host_groups=None, all_host_groups=False,
@@ -338,7 +275,7 @@ class RoleManager(base.Manager):
         return self._delete('/config/role/%s' % base.get_id(role))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -361,4 +298,4 @@ class RoleManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/role%s' % qstring)
+        return self._list('/config/role%s' % qstring, prefetch=prefetch)
@@ -182,6 +182,7 @@ class ServiceCheck(base.Resource):
 class ServiceCheckManager(base.Manager):
 
     resource_class = ServiceCheck
+    resource_type = 'servicecheck'
 
     def get(self, check):
         return self._get('/config/servicecheck/%s' % base.get_id(check))
@@ -376,7 +377,7 @@ class ServiceCheckManager(base.Manager):
         return self._create('/config/servicecheck', body=body)
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -399,4 +400,5 @@ class ServiceCheckManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/servicecheck%s' % qstring)
+        return self._list('/config/servicecheck%s' % qstring,
+                          prefetch=prefetch)
@@ -101,6 +101,7 @@ class ServiceGroup(base.Resource):
 class ServiceGroupManager(base.Manager):
 
     resource_class = ServiceGroup
+    resource_type = 'servicegroup'
 
     def get(self, group):
         return self._get('/config/servicegroup/%s' % base.get_id(group))
@@ -126,7 +127,7 @@ class ServiceGroupManager(base.Manager):
         return self._delete('/config/servicegroup/%s' % base.get_id(group))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -149,4 +150,5 @@ class ServiceGroupManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/servicegroup%s' % qstring)
+        return self._list('/config/servicegroup%s' % qstring,
+                          prefetch=prefetch)
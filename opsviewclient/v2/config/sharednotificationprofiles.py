@@ -67,6 +67,7 @@ class SharedNotificationProfile(base.Resource):
 class SharedNotificationProfileManager(base.Manager):
 
     resource_class = SharedNotificationProfile
+    resource_type = 'sharednotificationprofile'
 
     def get(self, profile):
         return self._get('/config/sharednotificationprofile/%s' %
@@ -77,7 +78,7 @@ class SharedNotificationProfileManager(base.Manager):
                             base.get_id(profile))
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -100,4 +101,5 @@ class SharedNotificationProfileManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/sharednotificationprofile%s' % qstring)
+        return self._list('/config/sharednotificationprofile%s' % qstring,
+                          prefetch=prefetch)
@@ -33,14 +33,7 @@ class Tenancy(base.Resource):
 
     @property
     def primary_role(self):
-        if not self._info.get('primary_role'):
-            return
-
-        if not self.manager:
-            return self._info['primary_role']
-
-        pr_id = base.id_from_ref(self._info['primary_role'])
-        return self.manager.client.config.roles.get(pr_id)
+        return self._ref('primary_role', 'roles')
 
     def __repr__(self):
         return '<Tenancy: %s>' % self.name
@@ -52,6 +45,7 @@ class Tenancy(base.Resource):
 class TenancyManager(base.Manager):
 
     resource_class = Tenancy
+    resource_type = 'tenancy'
 
     def get(self, tenancy):
         return self._get('/config/tenancy/%s' % base.get_id(tenancy))
@@ -62,7 +56,7 @@ class TenancyManager(base.Manager):
     # def create(self, name, description=None, )
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -85,4 +79,4 @@ class TenancyManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/tenancy%s' % qstring)
+        return self._list('/config/tenancy%s' % qstring, prefetch=prefetch)
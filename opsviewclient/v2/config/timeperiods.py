@@ -77,59 +77,20 @@ class TimePeriod(base.Resource):
 
     @property
     def host_check_periods(self):
-        if not self._info.get('host_check_periods'):
-            return
-
-        if not self.manager:
-            for h in self._info['host_check_periods']:
-                yield h
-
-        else:
-            for h in self._info['host_check_periods']:
-                h_id = base.id_from_ref(h)
-                yield self.manager.client.config.hosts.get(h_id)
+        return self._ref_list('host_check_periods', 'hosts')
 
     @property
     def host_notification_periods(self):
-        if not self._info.get('host_notification_periods'):
-            return
-
-        if not self.manager:
-            for h in self._info['host_notification_periods']:
-                yield h
-
-        else:
-            for h in self._info['host_notification_periods']:
-                h_id = base.id_from_ref(h)
-                yield self.manager.client.config.hosts.get(h_id)
+        return self._ref_list('host_notification_periods', 'hosts')
 
     @property
     def service_check_check_periods(self):
-        if not self._info.get('servicecheck_check_periods'):
-            return
-
-        if not self.manager:
-            for sc in self._info['servicecheck_check_periods']:
-                yield sc
-
-        else:
-            for sc in self._info['servicecheck_check_periods']:
-                sc_id = base.id_from_ref(sc)
-                yield self.manager.client.config.servicechecks.get(sc_id)
+        return self._ref_list('servicecheck_check_periods', 'servicechecks')
 
     @property
     def service_check_notification_periods(self):
-        if not self._info.get('servicecheck_notification_periods'):
-            return
-
-        if not self.manager:
-            for sc in self._info['servicecheck_notification_periods']:
-                yield sc
-
-        else:
-            for sc in self._info['servicecheck_notification_periods']:
-                sc_id = base.id_from_ref(sc)
-                yield self.manager.client.config.servicechecks.get(sc_id)
+        return self._ref_list('servicecheck_notification_periods',
+                              'servicechecks')
 
     def __repr__(self):
         return '<TimePeriod: %s>' % self.name
@@ -141,6 +102,8 @@ class TimePeriod(base.Resource):
 class TimePeriodManager(base.Manager):
 
     resource_class = TimePeriod
+    resource_type = 'timeperiod'
+    cache_ttl = 3600
 
     def get(self, time_period):
         return self._get('/config/timeperiod/%s' % base.get_id(time_period))
@@ -192,7 +155,7 @@ class TimePeriodManager(base.Manager):
                             body=body, params=params)
 
     def list(self, rows='all', page=None, cols=None, order=None, search=None,
-             in_use=None, kwds=None):
+             in_use=None, kwds=None, prefetch=None):
 
         qparams = {}
 
@@ -215,4 +178,4 @@ class TimePeriodManager(base.Manager):
         qparams = sorted(qparams.items(), key=lambda x: x[0])
         qstring = "?%s" % parse.urlencode(qparams) if qparams else ""
 
-        return self._list('/config/timeperiod%s' % qstring)
+        return self._list('/config/timeperiod%s' % qstring, prefetch=prefetch)